@@ -4,11 +4,11 @@ import pandas as pd
 from datetime import datetime
 
 # Import utilities
-from utils.data_loader import load_data, filter_data
+from utils.data_loader import load_data, filter_data, refresh_month_catalog, DEFAULT_MONTH, MONTH_ALIASES
 from utils.calculations import calculate_work_days, calculate_employee_stats
 
 # Import components
-from components.sidebar import render_sidebar_filters
+from components.sidebar import render_sidebar_filters, render_prewarm_status
 
 # Import reports
 from reports.excel_report import create_excel_report
@@ -45,7 +45,7 @@ st.markdown("""
 if 'current_page' not in st.session_state:
     st.session_state.current_page = 'landing'
 if 'selected_month' not in st.session_state:
-    st.session_state.selected_month = 'january'
+    st.session_state.selected_month = DEFAULT_MONTH
 
 # Navigation function
 def navigate_to(page):
@@ -160,23 +160,10 @@ if st.session_state.current_page == 'landing':
     )
     st.markdown("---")
 
-    # Pilihan periode data (2025–2026)
-    month_options = {
-        '2025-03': 'Maret 2025',
-        '2025-04': 'April 2025',
-        '2025-05': 'Mei 2025',
-        '2025-06': 'Juni 2025',
-        '2025-07': 'Juli 2025',
-        '2025-08': 'Agustus 2025',
-        '2025-09': 'September 2025',
-        '2025-10': 'Oktober 2025',
-        '2025-11': 'November 2025',
-        '2025-12': 'Desember 2025',
-        'january': 'Januari 2026',
-        'february': 'Februari 2026',
-        'march': 'Maret 2026',
-    }
+    # Pilihan periode data dari katalog folder data (2025/, 2026/, ...)
+    month_options = refresh_month_catalog()
     month_list = list(month_options.keys())
+    st.session_state.selected_month = MONTH_ALIASES.get(st.session_state.selected_month, st.session_state.selected_month)
     default_idx = month_list.index(st.session_state.selected_month) if st.session_state.selected_month in month_options else 0
     selected_month_landing = st.selectbox(
         "Pilih periode data",
@@ -187,6 +174,7 @@ if st.session_state.current_page == 'landing':
     )
     st.session_state.selected_month = selected_month_landing
     st.caption(f"Periode yang dipilih: **{month_options[selected_month_landing]}**")
+    render_prewarm_status(st)
     st.markdown("---")
 
     st.markdown("""
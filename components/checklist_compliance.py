@@ -1,38 +1,27 @@
 """Checklist compliance component"""
 import streamlit as st
+import numpy as np
 import pandas as pd
-from utils.data_loader import time_to_minutes
-from utils.calculations import get_check_in_deadline_minutes, get_check_out_minimum_minutes
 from reports.pdf_report import create_table_pdf
+from utils.employee_search import EmployeeSearchIndex
 
 
-def check_in_out_time(row):
-    """Check jam masuk on time dan pulang tidak early out (puasa: pulang >= 16:00; normal >= 17:00; batas masuk per tanggal)."""
-    check_in_minutes = time_to_minutes(row['Check In'])
-    check_out_minutes = time_to_minutes(row['Check Out'])
-    
-    if check_in_minutes is None or check_out_minutes is None:
-        return '❌'
-    
-    target_check_in = get_check_in_deadline_minutes(row['Date'])
-    target_check_out = get_check_out_minimum_minutes(row['Date'])
-    
-    if check_in_minutes <= target_check_in and check_out_minutes >= target_check_out:
-        return '✅'
-    else:
-        return '❌'
+def check_in_out_time(df):
+    """Check jam masuk on time dan pulang tidak early out untuk seluruh baris (batas dari jadwal shift / kalender per tanggal)."""
+    # Flag relatif ke jadwal shift (termasuk shift malam) sudah dihitung saat load_data; Check In/Out kosong -> False.
+    # Jam yang tidak cocok dengan jadwal shift (label shift di export salah) tidak dinilai -> ⚠️, bukan ✅/❌
+    compliant = df['Is Check In On Time'] & df['Is Check Out On Time']
+    status = np.where(df['Is Schedule Mismatch'], '⚠️', np.where(compliant, '✅', '❌'))
+    return pd.Series(status, index=df.index)
 
 
-def render_checklist_compliance(filtered_df, selected_branch):
-    """Render tabel checklist compliance"""
+def render_checklist_compliance(filtered_df, selected_branch, search_index=None):
+    """Render tabel checklist compliance (search_index: AnalysisContext.search_index; None = dibangun dari filtered_df)"""
     st.header("✅ Tabel Checklist Compliance")
     st.markdown("Checklist untuk memverifikasi compliance karyawan terhadap standar kerja")
     
-    # Buat tabel checklist
-    checklist_data = filtered_df.copy()
-    
-    # Filter hanya yang hadir
-    checklist_data = checklist_data[checklist_data['Is Present'] == True].copy()
+    # Buat tabel checklist: hanya yang hadir (hasil mask sudah frame baru, filtered_df bersama tidak disalin dulu)
+    checklist_data = filtered_df[filtered_df['Is Present'] == True]
     
     # Checklist 1: Kerja 8 jam per hari (total working hours tetap 8 jam; Ramadan istirahat 30 menit)
     checklist_data['Checklist_8_Jam'] = checklist_data['Real Working Hour Decimal'].apply(
@@ -40,14 +29,14 @@ def render_checklist_compliance(filtered_df, selected_branch):
     )
     
     # Checklist 2: Jam masuk on time dan pulang on time (batas masuk & pulang mengikuti tanggal: puasa / normal)
-    checklist_data['Checklist_Jam_8_17'] = checklist_data.apply(check_in_out_time, axis=1)
+    checklist_data['Checklist_Jam_8_17'] = check_in_out_time(checklist_data)
     
     # Pilih kolom untuk checklist (dengan Branch dan Organization untuk display di UI)
     checklist_display = checklist_data[[
         'Date', 'Employee ID', 'Full Name', 'Branch', 'Organization', 'Job Position',
         'Shift', 'Check In', 'Check Out', 'Real Working Hour', 'Real Working Hour Decimal',
         'Checklist_8_Jam', 'Checklist_Jam_8_17'
-    ]].copy()
+    ]]
     
     # Filter tanggal untuk checklist
     col_check1, col_check2 = st.columns(2)
@@ -62,16 +51,16 @@ def render_checklist_compliance(filtered_df, selected_branch):
     checklist_display_filtered = checklist_display[
         (checklist_display['Date'].dt.date >= date_start_check) &
         (checklist_display['Date'].dt.date <= date_end_check)
-    ].copy()
+    ]
     
     # Search box untuk checklist (sebelum rename)
     search_checklist = st.text_input("🔍 Cari Karyawan (Nama atau ID) - Checklist", "", key='search_checklist')
     if search_checklist:
-        mask_check = (
-            checklist_display_filtered['Full Name'].str.contains(search_checklist, case=False, na=False) |
-            checklist_display_filtered['Employee ID'].astype(str).str.contains(search_checklist, case=False, na=False)
-        )
-        checklist_display_filtered = checklist_display_filtered[mask_check]
+        if search_index is None:
+            search_index = EmployeeSearchIndex.from_frame(filtered_df)
+        # Nama yang cocok dicari di index karyawan unik, baris cukup difilter per nama (tanpa operasi string per baris)
+        mask_check = checklist_display_filtered['Full Name'].isin(search_index.search(search_checklist))
+        checklist_display_filtered = checklist_display_filtered[mask_check.to_numpy()]
     
     # Sort berdasarkan nama dulu, baru tanggal (untuk grouping per orang)
     checklist_display_filtered = checklist_display_filtered.sort_values(['Full Name', 'Date'], ascending=[True, True])
@@ -95,6 +84,7 @@ def render_checklist_compliance(filtered_df, selected_branch):
     total_checklist = len(checklist_display_filtered)
     compliant_8jam = len(checklist_display_filtered[checklist_display_filtered['✅ Kerja 8 Jam/Hari'] == '✅'])
     compliant_8_17 = len(checklist_display_filtered[checklist_display_filtered['✅ Jam Masuk & Pulang On Time'] == '✅'])
+    mismatch_8_17 = len(checklist_display_filtered[checklist_display_filtered['✅ Jam Masuk & Pulang On Time'] == '⚠️'])
     compliant_both = len(checklist_display_filtered[
         (checklist_display_filtered['✅ Kerja 8 Jam/Hari'] == '✅') &
         (checklist_display_filtered['✅ Jam Masuk & Pulang On Time'] == '✅')
@@ -106,7 +96,8 @@ def render_checklist_compliance(filtered_df, selected_branch):
     with col_check_stat2:
         st.metric("✅ Kerja 8 Jam/Hari", f"{compliant_8jam} ({(compliant_8jam/total_checklist*100) if total_checklist > 0 else 0:.1f}%)")
     with col_check_stat3:
-        st.metric("✅ Jam Masuk & Pulang On Time", f"{compliant_8_17} ({(compliant_8_17/total_checklist*100) if total_checklist > 0 else 0:.1f}%)")
+        st.metric("✅ Jam Masuk & Pulang On Time", f"{compliant_8_17} ({(compliant_8_17/total_checklist*100) if total_checklist > 0 else 0:.1f}%)",
+                 help=f"⚠️ Jadwal tidak sesuai (jam tidak cocok dengan label shift, tidak dinilai): {mismatch_8_17} record")
     with col_check_stat4:
         st.metric("✅ Keduanya Compliant", f"{compliant_both} ({(compliant_both/total_checklist*100) if total_checklist > 0 else 0:.1f}%)")
     
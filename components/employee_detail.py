@@ -1,31 +1,39 @@
 """Employee detail component"""
 import streamlit as st
+import numpy as np
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-from utils.data_loader import parse_check_in_to_minutes
-from utils.formatters import format_hours
-from utils.calculations import get_check_in_deadline_minutes
+from utils.time_parser import to_minutes
+from utils.filter_index import rows_for_name
+from utils.employee_search import EmployeeSearchIndex
+from utils.formatters import format_hours, format_clock_minutes
+from utils.rollup import build_employee_cube, employee_profiles_from_cube
 from reports.pdf_report import create_table_pdf
 
 
-def render_personal_summary_stats_for_employee(selected_employee, employee_stats, filtered_df, work_days_month, selected_branch, selected_org):
-    """Render ringkasan statistik untuk 1 karyawan yang dipilih"""
+def _profile_row(profiles, selected_employee):
+    """Baris profil karyawan (lookup satu baris, tanpa scan data harian)"""
+    return profiles[(profiles['Full Name'] == selected_employee).to_numpy()].iloc[0]
+
+
+def render_personal_summary_stats_for_employee(selected_employee, employee_stats, profile, work_days_month, selected_branch, selected_org):
+    """Render ringkasan statistik untuk 1 karyawan yang dipilih (profile: baris employee_profiles_from_cube)"""
     st.header("📈 Ringkasan Statistik")
     
     # Get employee data
     emp_data = employee_stats[employee_stats['Full Name'] == selected_employee].iloc[0]
-    emp_detail = filtered_df[filtered_df['Full Name'] == selected_employee].copy()
     
     # Untuk personal, total karyawan = 1
     total_employees = 1
     
     # Hitung metrik untuk karyawan yang dipilih
-    total_present = emp_detail['Is Present'].sum()
-    total_absent = emp_detail['Is Absent'].sum()
-    total_leave = int(emp_detail['Is Leave'].sum()) if 'Is Leave' in emp_detail.columns else 0
-    total_sick = int(emp_detail['Is Sick'].sum()) if 'Is Sick' in emp_detail.columns else 0
-    total_work_day = total_employees * work_days_month
+    total_present = profile['Jumlah Hadir']
+    total_absent = profile['Jumlah Absen']
+    total_leave = int(profile['Jumlah Cuti'])
+    total_sick = int(profile['Jumlah Sakit'])
+    # Work Day karyawan ini (prorata sejak Join Date jika masuk di tengah bulan)
+    total_work_day = int(emp_data['Work Days Bulan Ini']) if 'Work Days Bulan Ini' in emp_data.index else total_employees * work_days_month
     # Hitung persentase relatif terhadap Total Work Day
     attendance_percentage = (total_present / total_work_day * 100) if total_work_day > 0 else 0
     absent_percentage = (total_absent / total_work_day * 100) if total_work_day > 0 else 0
@@ -46,7 +54,7 @@ def render_personal_summary_stats_for_employee(selected_employee, employee_stats
     with col_stat2:
         st.metric("Work Day", work_days_month, help="Formula: Jumlah hari kerja (Senin-Jumat) dalam bulan")
     with col_stat3:
-        st.metric("Total Work Day", total_work_day, help="Formula: Total Karyawan × Work Day = 1 × Work Day")
+        st.metric("Total Work Day", total_work_day, help="Formula: Work Day karyawan ini (dihitung sejak Join Date jika masuk di tengah bulan)")
     with col_stat4:
         st.metric("Total Kehadiran", f"{int(total_present)} ({attendance_percentage:.1f}%)", 
                  help=f"Formula: SUM(Is Present) untuk karyawan ini\nPersentase: (Total Kehadiran / Total Work Day) × 100%")
@@ -63,13 +71,13 @@ def render_personal_summary_stats_for_employee(selected_employee, employee_stats
     # Baris kedua untuk Total Jam Kerja
     col_jam1, col_jam2 = st.columns(2)
     
-    total_records_with_hours = len(emp_detail[emp_detail['Real Working Hour Decimal'] > 0])
+    total_records_with_hours = int(profile['Hari Dengan Jam Kerja'])
     
     with col_jam1:
         help_text_real = (
             f"Formula: SUM(Real Working Hour Decimal) untuk karyawan ini\n"
             f"Penjelasan: Menjumlahkan semua jam kerja real dari record absensi karyawan ini\n"
-            f"Total Record: {len(emp_detail):,} record\n"
+            f"Total Record: {int(profile['Hari Record']):,} record\n"
             f"Record dengan Jam Kerja: {total_records_with_hours:,} record\n"
             f"Hasil {total_jam_kerja_real_formatted} menunjukkan total jam kerja aktual untuk karyawan ini"
         )
@@ -160,6 +168,56 @@ def render_personal_summary_stats_for_employee(selected_employee, employee_stats
         )
 
 
+# Kolom tabel profil semua karyawan: kolom profil -> judul kolom
+PROFILE_DISPLAY_COLUMNS = {
+    'Employee ID': 'ID',
+    'Full Name': 'Nama',
+    'Organization': 'Organization',
+    'Job Position': 'Posisi',
+    'Hari Record': 'Hari Record',
+    'Kehadiran (%)': 'Kehadiran (%)',
+    'Hari Kerja >= 8 Jam': 'Hari ≥ 8 Jam',
+    'Hari Kerja >= 8 Jam (%)': 'Hari ≥ 8 Jam (%)',
+    'Jumlah Masuk On Time': 'Masuk On Time',
+    'Masuk On Time (%)': 'Masuk On Time (%)',
+    'Jumlah Sakit': 'Sakit',
+    'Check In Paling Awal': 'Jam Masuk Paling Awal',
+    'Check In Median': 'Jam Masuk Median',
+    'Check In Paling Akhir': 'Jam Masuk Paling Akhir',
+}
+
+
+def render_employee_profiles(profiles, selected_branch, selected_org):
+    """Render tabel profil semua karyawan (diurutkan per metrik) + download CSV"""
+    st.markdown("### 🏅 Profil Semua Karyawan")
+    st.caption("Compliance dan jam masuk tiap karyawan dalam filter ini; urutkan untuk melihat peringkat.")
+    
+    sort_options = ['Masuk On Time (%)', 'Hari Kerja >= 8 Jam (%)', 'Kehadiran (%)', 'Check In Median', 'Jumlah Sakit']
+    sort_options = [col for col in sort_options if col in profiles.columns]
+    sort_col1, sort_col2 = st.columns([3, 1])
+    with sort_col1:
+        sort_by = st.selectbox("Urutkan berdasarkan", options=sort_options,
+                               format_func=lambda col: PROFILE_DISPLAY_COLUMNS[col], key='profile_sort')
+    with sort_col2:
+        ascending = st.checkbox("Terkecil dulu", value=False, key='profile_sort_ascending')
+    
+    columns = [col for col in PROFILE_DISPLAY_COLUMNS if col in profiles.columns]
+    ranked = profiles.sort_values(sort_by, ascending=ascending, kind='stable', na_position='last')[columns]
+    ranked = ranked.rename(columns=PROFILE_DISPLAY_COLUMNS)
+    for col in ['Check In Paling Awal', 'Check In Median', 'Check In Paling Akhir']:
+        ranked[PROFILE_DISPLAY_COLUMNS[col]] = ranked[PROFILE_DISPLAY_COLUMNS[col]].map(format_clock_minutes)
+    ranked.insert(0, 'Peringkat', range(1, len(ranked) + 1))
+    
+    st.dataframe(ranked, use_container_width=True, height=400, hide_index=True)
+    st.download_button(
+        label="📥 Download Profil Semua Karyawan (CSV)",
+        data=ranked.to_csv(index=False),
+        file_name=f"profil_karyawan_{selected_branch}_{selected_org}.csv",
+        mime="text/csv",
+        key='download_profiles_csv'
+    )
+
+
 def get_status(row):
     """Get status untuk setiap hari"""
     if row['Is Present']:
@@ -174,20 +232,22 @@ def get_status(row):
         return '❓ Tidak Diketahui'
 
 
-def render_employee_detail(employee_stats, filtered_df, work_days_month=None, selected_branch=None, selected_org=None):
-    """Render detail per karyawan"""
+def render_employee_detail(employee_stats, filtered_df, work_days_month=None, selected_branch=None, selected_org=None,
+                           profiles=None, search_index=None):
+    """Render detail per karyawan (profiles / search_index dari AnalysisContext; None = dihitung dari data yang ada)"""
     st.header("🔍 Detail Per Karyawan")
     
-    # Search box untuk memilih karyawan
-    employee_list = sorted(employee_stats['Full Name'].unique())
+    if profiles is None:
+        profiles = employee_profiles_from_cube(build_employee_cube(filtered_df))
+    if search_index is None:
+        search_index = EmployeeSearchIndex.from_frame(employee_stats)
+    
+    # Search box untuk memilih karyawan (hasil terurut relevansi: ID/nama persis, prefix, lalu substring)
+    employee_list = search_index.names
     search_employee = st.text_input("🔍 Cari Karyawan", "", placeholder="Ketik nama atau ID karyawan...")
     
     if search_employee:
-        filtered_employees = [
-            emp for emp in employee_list 
-            if search_employee.lower() in emp.lower() or 
-            search_employee in str(employee_stats[employee_stats['Full Name'] == emp]['Employee ID'].iloc[0])
-        ]
+        filtered_employees = search_index.search(search_employee)
         if filtered_employees:
             selected_employee = st.selectbox("Pilih Karyawan", options=filtered_employees, key='employee_select')
         else:
@@ -200,11 +260,13 @@ def render_employee_detail(employee_stats, filtered_df, work_days_month=None, se
         # Render Summary Statistik Personal untuk karyawan yang dipilih
         if work_days_month is not None:
             render_personal_summary_stats_for_employee(
-                selected_employee, employee_stats, filtered_df, work_days_month, selected_branch, selected_org
+                selected_employee, employee_stats, _profile_row(profiles, selected_employee),
+                work_days_month, selected_branch, selected_org
             )
             st.markdown("---")
         emp_data = employee_stats[employee_stats['Full Name'] == selected_employee].iloc[0]
-        emp_detail = filtered_df[filtered_df['Full Name'] == selected_employee].copy()
+        profile = _profile_row(profiles, selected_employee)
+        emp_detail = rows_for_name(filtered_df, selected_employee)
         
         # Header dengan informasi karyawan
         st.markdown("### 👤 Informasi Karyawan")
@@ -221,21 +283,13 @@ def render_employee_detail(employee_stats, filtered_df, work_days_month=None, se
         
         st.markdown("---")
         
-        # Statistik utama — dihitung dulu yang dipakai di beberapa metrik
-        total_work_8_hours = len(emp_detail[emp_detail['Real Working Hour Decimal'] >= 8])
-        emp_detail_with_checkin = emp_detail[emp_detail['Check In'].notna() & (emp_detail['Check In'] != '')].copy()
-        if len(emp_detail_with_checkin) > 0:
-            emp_detail_with_checkin['Check In Minutes'] = emp_detail_with_checkin['Check In'].apply(parse_check_in_to_minutes)
-            emp_detail_with_checkin['Deadline Minutes'] = emp_detail_with_checkin['Date'].apply(get_check_in_deadline_minutes)
-            total_clock_on_time = len(emp_detail_with_checkin[
-                emp_detail_with_checkin['Check In Minutes'].notna() &
-                (emp_detail_with_checkin['Check In Minutes'] <= emp_detail_with_checkin['Deadline Minutes'])
-            ])
-        else:
-            total_clock_on_time = 0
-        total_sick = int(emp_detail['Is Sick'].sum()) if 'Is Sick' in emp_detail.columns else 0
-        n_days = len(emp_detail)
+        # Statistik utama dari profil karyawan (batas masuk per baris dari jadwal shift / kalender,
+        # lihat utils/schedule_policy.py)
+        total_work_8_hours = int(profile['Hari Kerja >= 8 Jam'])
+        total_clock_on_time = int(profile['Jumlah Masuk On Time'])
+        total_sick = int(profile['Jumlah Sakit'])
         attendance_rate = (emp_data['Jumlah Hadir'] / emp_data['Work Days Bulan Ini'] * 100) if emp_data['Work Days Bulan Ini'] > 0 else 0
+        n_days = int(profile['Hari Record'])
         work_8_pct = (total_work_8_hours / n_days * 100) if n_days > 0 else 0
         clock_on_time_pct = (total_clock_on_time / n_days * 100) if n_days > 0 else 0
 
@@ -324,6 +378,11 @@ def render_employee_detail(employee_stats, filtered_df, work_days_month=None, se
         
         # Line chart jam masuk per hari kerja
         st.markdown("### 📈 Jam Masuk per Hari Kerja")
+        st.caption(
+            f"Jam masuk paling awal {format_clock_minutes(profile['Check In Paling Awal'])} · "
+            f"median {format_clock_minutes(profile['Check In Median'])} · "
+            f"paling akhir {format_clock_minutes(profile['Check In Paling Akhir'])}"
+        )
         
         min_date_chart = emp_detail['Date'].min().date() if not emp_detail['Date'].empty else pd.Timestamp.now().date()
         max_date_chart = emp_detail['Date'].max().date() if not emp_detail['Date'].empty else pd.Timestamp.now().date()
@@ -333,11 +392,11 @@ def render_employee_detail(employee_stats, filtered_df, work_days_month=None, se
             (emp_detail['Is Dayoff'] == False) &
             (emp_detail['Date'].dt.date >= min_date_chart) &
             (emp_detail['Date'].dt.date <= max_date_chart)
-        ].copy()
+        ]
         
         if len(work_days_data) > 0:
-            work_days_data['Check In Minutes'] = work_days_data['Check In'].apply(parse_check_in_to_minutes)
-            work_days_data = work_days_data[work_days_data['Check In Minutes'].notna()].copy()
+            work_days_data['Check In Minutes'] = to_minutes(work_days_data['Check In'], zero_as_missing=True)
+            work_days_data = work_days_data[work_days_data['Check In Minutes'].notna()]
             
             if len(work_days_data) > 0:
                 work_days_data = work_days_data.sort_values('Date')
@@ -411,7 +470,7 @@ def render_employee_detail(employee_stats, filtered_df, work_days_month=None, se
         emp_detail_filtered = emp_detail[
             (emp_detail['Date'].dt.date >= detail_date_start) &
             (emp_detail['Date'].dt.date <= detail_date_end)
-        ].copy()
+        ]
         
         emp_detail_filtered['Status'] = emp_detail_filtered.apply(get_status, axis=1)
         
@@ -421,19 +480,17 @@ def render_employee_detail(employee_stats, filtered_df, work_days_month=None, se
             axis=1
         )
         
-        # Kolom Check In Range: batas per tanggal (Mar 1–17 → 07:30, Feb 19–28 → 07:45, normal 08:15)
-        def check_in_time_range(row):
-            check_in_minutes = parse_check_in_to_minutes(row['Check In'])
-            if check_in_minutes is None:
-                return '❌'
-            deadline = get_check_in_deadline_minutes(row['Date'])
-            return '✅' if check_in_minutes <= deadline else '❌'
-        
-        emp_detail_filtered['Check In Range'] = emp_detail_filtered.apply(check_in_time_range, axis=1)
+        # Kolom Check In Range: batas per baris dari jadwal shift (mis. Pagi 06:15, Malam 18:15) atau kalender
+        # (puasa Mar 1–17 → 07:30, Feb 19–28 → 07:45, normal 08:15)
+        # Jam yang tidak cocok dengan label shift tidak dinilai -> ⚠️
+        emp_detail_filtered['Check In Range'] = np.where(
+            emp_detail_filtered['Is Schedule Mismatch'], '⚠️',
+            np.where(emp_detail_filtered['Is Check In On Time'], '✅', '❌')
+        )
         
         detail_cols = ['Date', 'Status', 'Compliance', 'Check In Range', 'Shift', 'Check In', 'Check Out', 'Late In', 'Early Out',
                       'Real Working Hour', 'Attendance Code']
-        detail_display = emp_detail_filtered[detail_cols].copy()
+        detail_display = emp_detail_filtered[detail_cols]
         detail_display = detail_display.sort_values('Date', ascending=False)
         detail_display['Date'] = detail_display['Date'].dt.strftime('%Y-%m-%d (%A)')
         
@@ -481,4 +538,5 @@ def render_employee_detail(employee_stats, filtered_df, work_days_month=None, se
             )
         
         st.markdown("---")
-
+    
+    render_employee_profiles(profiles, selected_branch, selected_org)
@@ -6,13 +6,13 @@ from utils.formatters import format_hours
 from reports.pdf_report import create_table_pdf
 
 
-def render_organization_report(filtered_df, work_days_month, employee_stats_full, selected_branch, selected_org):
-    """Render raport per organization"""
+def render_organization_report(filtered_df, work_days_month, employee_stats_full, selected_branch, selected_org, org_stats=None):
+    """Render raport per organization. org_stats: hasil roll-up cube (AnalysisContext.org_stats); jika kosong dihitung dari filtered_df."""
     st.header("📋 Raport per Organization")
     st.markdown("Ringkasan statistik absensi per Organization")
     
-    # Hitung statistik per organization
-    org_stats = calculate_organization_stats(filtered_df, work_days_month)
+    # Hitung statistik per organization (copy: org_stats dari context dipakai bersama)
+    org_stats = calculate_organization_stats(filtered_df, work_days_month) if org_stats is None else org_stats.copy()
     
     # Format jam kerja
     org_stats['Total Jam Kerja (Real) Formatted'] = org_stats['Total Jam Kerja (Real)'].apply(format_hours)
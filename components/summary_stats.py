@@ -2,20 +2,34 @@
 import streamlit as st
 import pandas as pd
 from utils.formatters import format_hours
-from utils.calculations import calculate_employee_stats
 from reports.pdf_report import create_table_pdf
 
 
-def render_summary_stats(filtered_df, work_days_month, employee_stats_full, selected_branch, selected_org, total_employees_baseline=None):
-    """Render ringkasan statistik. total_employees_baseline: jika diisi (mis. dari Januari), dipakai untuk Total Karyawan dan Total Work Day."""
+def render_summary_stats(filtered_df, work_days_month, employee_stats_full, selected_branch, selected_org, total_employees_baseline=None, summary_totals=None):
+    """Render ringkasan statistik. total_employees_baseline: jika diisi (mis. dari Januari), dipakai untuk Total Karyawan dan Total Work Day.
+
+    summary_totals: total hasil roll-up cube (AnalysisContext.summary_totals); jika kosong dihitung dari filtered_df.
+    """
     st.header("📈 Ringkasan Statistik")
 
+    if summary_totals is None:
+        summary_totals = {
+            'total_employees': filtered_df['Employee ID'].nunique(),
+            'total_present': filtered_df['Is Present'].sum(),
+            'total_leave': filtered_df['Is Leave'].sum(),
+            'total_dayoff': filtered_df['Is Dayoff'].sum(),
+            'total_records': len(filtered_df),
+            'total_records_with_hours': int((filtered_df['Real Working Hour Decimal'] > 0).sum()),
+        }
+
     # Total Karyawan: pakai baseline (Januari) jika ada, agar konsisten antar bulan
-    total_employees = total_employees_baseline if total_employees_baseline is not None else filtered_df['Employee ID'].nunique()
-    total_present = filtered_df['Is Present'].sum()
-    total_leave = filtered_df['Is Leave'].sum()
-    total_dayoff = filtered_df['Is Dayoff'].sum()
-    total_work_day = total_employees * work_days_month
+    total_employees = total_employees_baseline if total_employees_baseline is not None else summary_totals['total_employees']
+    total_present = summary_totals['total_present']
+    total_leave = summary_totals['total_leave']
+    total_dayoff = summary_totals['total_dayoff']
+    # Total Work Day: prorata per karyawan (sejak Join Date) dari roll-up cube; baseline tetap Total Karyawan × Work Day
+    prorated_work_day = summary_totals.get('total_work_day') if total_employees_baseline is None else None
+    total_work_day = prorated_work_day if prorated_work_day is not None else total_employees * work_days_month
     # Total Tidak Hadir = sisa hari kerja yang bukan hadir, sehingga Total Kehadiran + Total Tidak Hadir = Total Work Day
     total_tidak_hadir = total_work_day - total_present
     # Hitung persentase relatif terhadap Total Work Day
@@ -37,7 +51,11 @@ def render_summary_stats(filtered_df, work_days_month, employee_stats_full, sele
     with col_stat2:
         st.metric("Work Day", work_days_month, help="Formula: Jumlah hari kerja (Senin-Jumat) dalam bulan, dikurangi hari libur")
     with col_stat3:
-        st.metric("Total Work Day", total_work_day, help=f"Formula: Total Karyawan × Work Day\n= {total_employees} × {work_days_month} = {total_work_day}\n\nTotal Kehadiran + Total Tidak Hadir = Total Work Day")
+        if prorated_work_day is not None:
+            help_work_day = f"Formula: SUM(Work Day per karyawan), karyawan baru dihitung sejak Join Date\n= {total_work_day}\n\nTotal Kehadiran + Total Tidak Hadir = Total Work Day"
+        else:
+            help_work_day = f"Formula: Total Karyawan × Work Day\n= {total_employees} × {work_days_month} = {total_work_day}\n\nTotal Kehadiran + Total Tidak Hadir = Total Work Day"
+        st.metric("Total Work Day", total_work_day, help=help_work_day)
     with col_stat4:
         st.metric("Total Kehadiran", f"{total_present} ({attendance_percentage:.1f}%)", 
                  help=f"Formula: SUM(Is Present)\nPersentase: (Total Kehadiran / Total Work Day) × 100%\nTotal Kehadiran + Total Tidak Hadir = Total Work Day")
@@ -61,13 +79,13 @@ def render_summary_stats(filtered_df, work_days_month, employee_stats_full, sele
     # Baris ketiga untuk Total Jam Kerja
     col_stat8, col_stat9 = st.columns(2)
     
-    total_records_with_hours = len(filtered_df[filtered_df['Real Working Hour Decimal'] > 0])
+    total_records_with_hours = summary_totals['total_records_with_hours']
     
     with col_stat8:
         help_text_real = (
             f"Formula: SUM(Real Working Hour Decimal)\n"
             f"Penjelasan: Menjumlahkan semua jam kerja real dari semua record absensi\n"
-            f"Total Record: {len(filtered_df):,} record\n"
+            f"Total Record: {summary_totals['total_records']:,} record\n"
             f"Record dengan Jam Kerja: {total_records_with_hours:,} record\n"
             f"Hasil {total_jam_kerja_real_formatted} menunjukkan total jam kerja aktual dari semua record"
         )
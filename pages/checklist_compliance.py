@@ -1,6 +1,7 @@
 """Checklist Compliance page module"""
 import streamlit as st
-from utils.data_loader import load_data, filter_data
+from utils.data_loader import load_data, get_filter_index
+from utils.analysis_context import get_analysis_context
 from components.sidebar import render_sidebar_month, render_sidebar_filters
 from components.checklist_compliance import render_checklist_compliance
 
@@ -13,13 +14,16 @@ def render_checklist_page():
     df = load_data(selected_month)
 
     if df is not None:
-        selected_branch, selected_org = render_sidebar_filters(df)
+        filter_index = get_filter_index(selected_month, df)
+        selected_branch, selected_org = render_sidebar_filters(df, filter_index)
         
-        # Filter data
-        filtered_df = filter_data(df, selected_branch, selected_org)
+        # Filter data (bersama semua halaman)
+        context = get_analysis_context(selected_month, selected_branch, selected_org)
+        if context is None:
+            return
         
         # Render Checklist Compliance
-        render_checklist_compliance(filtered_df, selected_branch)
+        render_checklist_compliance(context.filtered_df, selected_branch, context.search_index)
     else:
         st.error("Gagal memuat data. Pastikan file CSV bulan yang dipilih ada di folder project.")
 
@@ -1,11 +1,10 @@
 """Dashboard page module"""
 import streamlit as st
-from utils.data_loader import load_data, filter_data
-from utils.calculations import calculate_work_days, calculate_employee_stats
+from utils.data_loader import load_data, get_filter_index
+from utils.analysis_context import get_analysis_context
 from components.sidebar import render_sidebar_month, render_sidebar_filters
 from components.summary_stats import render_summary_stats
 from components.visualizations import render_visualizations
-from utils.formatters import format_hours
 
 def render_dashboard():
     """Render the dashboard page"""
@@ -16,39 +15,22 @@ def render_dashboard():
     df = load_data(selected_month)
 
     if df is not None:
-        selected_branch, selected_org = render_sidebar_filters(df)
+        filter_index = get_filter_index(selected_month, df)
+        selected_branch, selected_org = render_sidebar_filters(df, filter_index)
 
-        # Filter data
-        filtered_df = filter_data(df, selected_branch, selected_org)
+        # Filter, hari kerja & employee stats dihitung sekali per filter dan dipakai bersama semua halaman
+        context = get_analysis_context(selected_month, selected_branch, selected_org)
+        if context is None:
+            return
+        filtered_df = context.filtered_df
+        work_days_month = context.work_days_month
+        employee_stats_full = context.employee_stats
 
         # Total Karyawan baseline dari Januari (agar sama di semua bulan)
-        total_employees_baseline = None
-        if selected_month != 'january':
-            df_january = load_data('january')
-            if df_january is not None:
-                january_filtered = filter_data(df_january, selected_branch, selected_org)
-                total_employees_baseline = january_filtered['Employee ID'].nunique()
-
-        # Hitung work days bulan ini
-        if not filtered_df['Date'].empty:
-            first_date = filtered_df['Date'].min()
-            year = first_date.year
-            month = first_date.month
-            work_days_month = calculate_work_days(year, month)
-        else:
-            work_days_month = 0
-
-        # Hitung employee stats
-        employee_stats_full = calculate_employee_stats(filtered_df, work_days_month)
-
-        # Format jam kerja untuk employee_stats
-        employee_stats_full['Total Jam Kerja (Real) Formatted'] = employee_stats_full['Total Jam Kerja (Real)'].apply(format_hours)
-        employee_stats_full['Total Jam Kerja (Plan) Formatted'] = employee_stats_full['Total Jam Kerja (Plan)'].apply(format_hours)
-        employee_stats_full['Total Jam Late In Formatted'] = employee_stats_full['Total Jam Late In'].apply(format_hours)
-        employee_stats_full['Total Jam Early Out Formatted'] = employee_stats_full['Total Jam Early Out'].apply(format_hours)
+        total_employees_baseline = context.total_employees_baseline
 
         # Render Summary Statistics (Total Karyawan = baseline Januari jika bukan bulan Januari)
-        render_summary_stats(filtered_df, work_days_month, employee_stats_full, selected_branch, selected_org, total_employees_baseline)
+        render_summary_stats(filtered_df, work_days_month, employee_stats_full, selected_branch, selected_org, total_employees_baseline, context.summary_totals)
         
         # Render Visualizations
         render_visualizations(employee_stats_full, selected_branch, work_days_month)
@@ -1,9 +1,11 @@
 """Dashboard Personal page module - Individual/Personal dashboard"""
 import streamlit as st
-from utils.data_loader import load_data, filter_data
-from utils.calculations import calculate_work_days, calculate_employee_stats
+from utils.data_loader import load_data, get_filter_index
+from utils.analysis_context import get_analysis_context
 from components.sidebar import render_sidebar_month, render_sidebar_filters
 from utils.formatters import format_hours
+from utils.time_parser import to_minutes
+from utils.filter_index import rows_for_name
 import plotly.express as px
 import plotly.graph_objects as go
 
@@ -16,28 +18,16 @@ def render_dashboard_personal():
     df = load_data(selected_month)
 
     if df is not None:
-        selected_branch, selected_org = render_sidebar_filters(df)
+        filter_index = get_filter_index(selected_month, df)
+        selected_branch, selected_org = render_sidebar_filters(df, filter_index)
         
-        # Filter data
-        filtered_df = filter_data(df, selected_branch, selected_org)
-        
-        # Hitung work days bulan ini
-        if not filtered_df['Date'].empty:
-            first_date = filtered_df['Date'].min()
-            year = first_date.year
-            month = first_date.month
-            work_days_month = calculate_work_days(year, month)
-        else:
-            work_days_month = 0
-        
-        # Hitung employee stats
-        employee_stats_full = calculate_employee_stats(filtered_df, work_days_month)
-        
-        # Format jam kerja untuk employee_stats
-        employee_stats_full['Total Jam Kerja (Real) Formatted'] = employee_stats_full['Total Jam Kerja (Real)'].apply(format_hours)
-        employee_stats_full['Total Jam Kerja (Plan) Formatted'] = employee_stats_full['Total Jam Kerja (Plan)'].apply(format_hours)
-        employee_stats_full['Total Jam Late In Formatted'] = employee_stats_full['Total Jam Late In'].apply(format_hours)
-        employee_stats_full['Total Jam Early Out Formatted'] = employee_stats_full['Total Jam Early Out'].apply(format_hours)
+        # Filter, hari kerja & employee stats dihitung sekali per filter dan dipakai bersama semua halaman
+        context = get_analysis_context(selected_month, selected_branch, selected_org)
+        if context is None:
+            return
+        filtered_df = context.filtered_df
+        work_days_month = context.work_days_month
+        employee_stats_full = context.employee_stats
         
         # Select employee untuk personal dashboard
         st.markdown("### 👤 Pilih Karyawan")
@@ -53,7 +43,7 @@ def render_dashboard_personal():
             
             # Get employee data
             emp_data = employee_stats_full[employee_stats_full['Full Name'] == selected_employee].iloc[0]
-            emp_detail = filtered_df[filtered_df['Full Name'] == selected_employee].copy()
+            emp_detail = rows_for_name(filtered_df, selected_employee)
             
             # Header dengan informasi karyawan
             st.markdown("### 👤 Informasi Karyawan")
@@ -153,12 +143,11 @@ def render_dashboard_personal():
                 work_days_data = emp_detail[
                     (emp_detail['Is Present'] == True) & 
                     (emp_detail['Is Dayoff'] == False)
-                ].copy()
+                ]
                 
                 if len(work_days_data) > 0:
-                    from utils.data_loader import parse_check_in_to_minutes
-                    work_days_data['Check In Minutes'] = work_days_data['Check In'].apply(parse_check_in_to_minutes)
-                    work_days_data = work_days_data[work_days_data['Check In Minutes'].notna()].copy()
+                    work_days_data['Check In Minutes'] = to_minutes(work_days_data['Check In'], zero_as_missing=True)
+                    work_days_data = work_days_data[work_days_data['Check In Minutes'].notna()]
                     
                     if len(work_days_data) > 0:
                         work_days_data = work_days_data.sort_values('Date')
@@ -233,7 +222,7 @@ def render_dashboard_personal():
                 st.metric(
                     "Plan (Ideal)",
                     f"{emp_data['Total Jam Kerja (Plan) Formatted']} (100%)",
-                    help=f"Total jam kerja ideal: {work_days_month} hari × 8 jam = {plant_hours_personal:.2f} jam"
+                    help=f"Total jam kerja ideal: {int(emp_data['Work Days Bulan Ini'])} hari × 8 jam = {plant_hours_personal:.2f} jam"
                 )
             
             with col_plant2:
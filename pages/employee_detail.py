@@ -1,8 +1,8 @@
 """Employee Detail page module"""
 import streamlit as st
 import pandas as pd
-from utils.data_loader import load_data, filter_data
-from utils.calculations import calculate_work_days, calculate_employee_stats
+from utils.data_loader import load_data, get_filter_index
+from utils.analysis_context import get_analysis_context
 from components.sidebar import render_sidebar_month, render_sidebar_filters
 from components.employee_detail import render_employee_detail
 from utils.formatters import format_hours
@@ -19,28 +19,16 @@ def render_employee_detail_page():
     df = load_data(selected_month)
 
     if df is not None:
-        selected_branch, selected_org = render_sidebar_filters(df)
+        filter_index = get_filter_index(selected_month, df)
+        selected_branch, selected_org = render_sidebar_filters(df, filter_index)
         
-        # Filter data
-        filtered_df = filter_data(df, selected_branch, selected_org)
-        
-        # Hitung work days bulan ini
-        if not filtered_df['Date'].empty:
-            first_date = filtered_df['Date'].min()
-            year = first_date.year
-            month = first_date.month
-            work_days_month = calculate_work_days(year, month)
-        else:
-            work_days_month = 0
-        
-        # Hitung employee stats
-        employee_stats_full = calculate_employee_stats(filtered_df, work_days_month)
-        
-        # Format jam kerja untuk employee_stats
-        employee_stats_full['Total Jam Kerja (Real) Formatted'] = employee_stats_full['Total Jam Kerja (Real)'].apply(format_hours)
-        employee_stats_full['Total Jam Kerja (Plan) Formatted'] = employee_stats_full['Total Jam Kerja (Plan)'].apply(format_hours)
-        employee_stats_full['Total Jam Late In Formatted'] = employee_stats_full['Total Jam Late In'].apply(format_hours)
-        employee_stats_full['Total Jam Early Out Formatted'] = employee_stats_full['Total Jam Early Out'].apply(format_hours)
+        # Filter, hari kerja & employee stats dihitung sekali per filter dan dipakai bersama semua halaman
+        context = get_analysis_context(selected_month, selected_branch, selected_org)
+        if context is None:
+            return
+        filtered_df = context.filtered_df
+        work_days_month = context.work_days_month
+        employee_stats_full = context.employee_stats
         
         # Prepare employee_stats for detail view
         employee_stats = employee_stats_full.copy()
@@ -57,7 +45,10 @@ def render_employee_detail_page():
         )
         
         # Render Employee Detail dengan summary statistik personal
-        render_employee_detail(employee_stats, filtered_df, work_days_month, selected_branch, selected_org)
+        render_employee_detail(
+            employee_stats, filtered_df, work_days_month, selected_branch, selected_org,
+            profiles=context.profiles, search_index=context.search_index
+        )
     else:
         st.error("Gagal memuat data. Pastikan file CSV bulan yang dipilih ada di folder project.")
 
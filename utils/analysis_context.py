@@ -0,0 +1,191 @@
+"""Konteks analisis bersama per (bulan, branch, organization): filter, hari kerja dan statistik karyawan dihitung sekali untuk semua halaman"""
+from dataclasses import dataclass
+
+import pandas as pd
+import streamlit as st
+
+from utils.business_calendar import month_bounds, month_work_days
+from utils.cache_store import read_precomputed
+from utils.data_loader import (
+    BASELINE_MONTH, load_data, load_data_version, filter_data, get_filter_index, data_version, resolve_month,
+    month_patch,
+)
+from utils.employee_search import EmployeeSearchIndex
+from utils.formatters import format_hours
+from utils.frame_cache import frame_cache, frame_nbytes
+from utils.single_flight import SingleFlight
+from utils.rollup import (
+    CUBE_VERSION, build_employee_cube, patch_employee_cube, slice_cube, with_work_days,
+    employee_stats_from_cube, employee_profiles_from_cube, organization_stats_from_cube, summary_totals_from_cube,
+)
+
+
+# Kolom jam di employee_stats yang diberi versi teks ('8 jam 30 menit') -> kolom '<nama> Formatted'
+FORMATTED_HOUR_COLUMNS = [
+    'Total Jam Kerja (Real)',
+    'Total Jam Kerja (Plan)',
+    'Total Jam Late In',
+    'Total Jam Early Out',
+]
+
+
+@dataclass(frozen=True)
+class AnalysisContext:
+    """Hasil bersama untuk satu filter bulan/branch/org.
+
+    Objek yang sama dipakai semua halaman (FrameCache), jadi frame di dalamnya read-only:
+    copy dulu sebelum menambah/mengubah kolom.
+    """
+    month: str
+    branch: str
+    org: str
+    filtered_df: pd.DataFrame
+    work_days_month: int
+    # Baris cube karyawan × bulan untuk filter ini (lihat utils/rollup.py)
+    cube: pd.DataFrame
+    employee_stats: pd.DataFrame
+    # Profil per karyawan (rasio compliance & jam masuk), satu baris per karyawan: detail karyawan = lookup baris
+    profiles: pd.DataFrame
+    # Index nama & Employee ID untuk kotak 'Cari Karyawan' (lihat utils/employee_search.py)
+    search_index: EmployeeSearchIndex
+    org_stats: pd.DataFrame
+    # Total untuk Ringkasan Statistik (roll-up cube)
+    summary_totals: dict
+    # Total Karyawan di bulan baseline untuk filter yang sama (None jika bulan ini = baseline)
+    total_employees_baseline: int = None
+
+    def nbytes(self):
+        """Perkiraan memori frame di konteks ini (dihitung ke anggaran FrameCache)."""
+        frames = (self.filtered_df, self.cube, self.employee_stats, self.profiles, self.org_stats)
+        return sum(frame_nbytes(frame) for frame in frames)
+
+
+def _period_for(filtered_df):
+    """(awal, akhir) bulan dari tanggal pertama data; None jika frame kosong."""
+    if filtered_df['Date'].empty:
+        return None
+    first_date = filtered_df['Date'].min()
+    return month_bounds(first_date.year, first_date.month)
+
+
+def _baseline_employees(month, branch, org):
+    if month == BASELINE_MONTH:
+        return None
+    df_baseline = load_data(BASELINE_MONTH)
+    if df_baseline is None:
+        return None
+    # Cukup hitung dari posisi baris filter (satu kolom), tanpa membentuk frame hasil filter bulan baseline
+    rows = get_filter_index(BASELINE_MONTH, df_baseline).rows(branch, org)
+    return df_baseline['Employee ID'].take(rows).nunique()
+
+
+# Cube terakhir per bulan: bulan -> (versi data, cube), dasar patch setelah ingest inkremental
+_latest_cubes = {}
+
+# Build cube/konteks bersamaan untuk key & versi data yang sama menunggu satu build
+_aggregate_builds = SingleFlight('aggregates')
+
+# Key FrameCache konteks yang pernah dibangun: ('context', bulan, branch, org, versi data), untuk invalidasi per bulan
+_context_keys = set()
+
+
+def _month_cube(month, version):
+    """Cube bulan dari FrameCache (keluar dari memori -> spill ke disk, bukan dibangun ulang); build bersamaan digabung."""
+    key = ('cube', month, version)
+    return _aggregate_builds.do(key, frame_cache().get, key, lambda: _build_month_cube(month, version), spill=True)
+
+
+def _build_month_cube(month, version):
+    cube = read_precomputed(month, f'cube-v{CUBE_VERSION}', version)
+    if cube is not None:
+        # Cube dari worker precompute (utils/precompute_worker.py)
+        _latest_cubes[month] = (version, cube)
+        return cube
+    df = load_data_version(month, version)
+    if df is None:
+        return None
+    excluded = get_filter_index(month, df).excluded
+    latest = _latest_cubes.get(month)
+    changed = month_patch(month, latest[0]) if latest else None
+    if changed is not None and len(excluded) == len(df):
+        # Export ulang bulan berjalan: hanya baris cube karyawan yang berubah yang dihitung ulang
+        cube = patch_employee_cube(latest[1], df, changed, excluded)
+    else:
+        cube = build_employee_cube(df, excluded)
+    _latest_cubes[month] = (version, cube)
+    return cube
+
+
+def get_month_cube(month):
+    """Cube karyawan × bulan (tanpa karyawan yang dikecualikan), dibangun sekali per bulan & versi data."""
+    month = resolve_month(month)
+    version = data_version(month)
+    return _month_cube(month, version)
+
+
+def _context(month, branch, org, version):
+    """Konteks dari FrameCache: filtered_df & statistik ikut anggaran memori bersama frame bulan dan cube."""
+    key = ('context', month, branch, org, version)
+    _context_keys.add(key)
+    return frame_cache().get(key, lambda: _build_context(month, branch, org, version), sizeof=AnalysisContext.nbytes)
+
+
+def _build_context(month, branch, org, version):
+    df = load_data_version(month, version)
+    month_cube = _month_cube(month, version)
+    if df is None or month_cube is None:
+        # Dilempar, bukan return None: exception tidak di-cache, jadi rerun berikutnya mencoba lagi
+        raise RuntimeError(f"Data bulan {month} gagal dimuat")
+    filtered_df = filter_data(df, branch, org, get_filter_index(month, df))
+    period = _period_for(filtered_df)
+    work_days_month = month_work_days(period[0].year, period[0].month) if period else 0
+    # Statistik karyawan/organization/total = roll-up kecil dari cube, bukan groupby ulang baris harian.
+    # Work Days & Plan per karyawan: prorata sejak Join Date (karyawan baru di tengah bulan)
+    cube = slice_cube(month_cube, branch, org)
+    if period:
+        cube = with_work_days(cube, *period)
+    employee_stats = employee_stats_from_cube(cube, work_days_month)
+    for col in FORMATTED_HOUR_COLUMNS:
+        employee_stats[f'{col} Formatted'] = employee_stats[col].apply(format_hours)
+    return AnalysisContext(
+        month=month,
+        branch=branch,
+        org=org,
+        filtered_df=filtered_df,
+        work_days_month=work_days_month,
+        cube=cube,
+        employee_stats=employee_stats,
+        profiles=employee_profiles_from_cube(cube),
+        search_index=EmployeeSearchIndex.from_frame(employee_stats),
+        org_stats=organization_stats_from_cube(cube, work_days_month),
+        summary_totals=summary_totals_from_cube(cube),
+        total_employees_baseline=_baseline_employees(month, branch, org),
+    )
+
+
+def load_analysis_context(month, branch, org):
+    """AnalysisContext untuk filter ini; dihitung sekali per (bulan, branch, org, versi data). Error dilempar ke pemanggil."""
+    month = resolve_month(month)
+    version = data_version(month)
+    return _aggregate_builds.do(('context', month, branch, org, version), _context, month, branch, org, version)
+
+
+def get_analysis_context(month, branch, org):
+    """load_analysis_context untuk halaman: jika gagal, pesan st.error ditampilkan dan mengembalikan None."""
+    try:
+        return load_analysis_context(month, branch, org)
+    except Exception as e:
+        st.error(f"Gagal menghitung analisis: {str(e)}")
+        return None
+
+
+def forget_month_aggregates(month, version):
+    """Buang cube & konteks analisis bulan untuk versi data lama dari cache.
+
+    Bulan baseline berubah -> konteks semua bulan ikut dibuang (Total Karyawan baseline di dalamnya basi).
+    """
+    frame_cache().discard(('cube', month, version))
+    for key in list(_context_keys):
+        if (key[1] == month and key[4] == version) or month == BASELINE_MONTH:
+            frame_cache().discard(key)
+            _context_keys.discard(key)
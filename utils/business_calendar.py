@@ -0,0 +1,69 @@
+"""Kalender hari kerja vektor (numpy.busday_count) dengan hari libur yang dikonfigurasi, termasuk hari kerja per karyawan sejak Join Date"""
+from calendar import monthrange
+
+import numpy as np
+import pandas as pd
+
+from utils.policy_calendar import policy_calendar, policy_version
+
+
+# Senin–Jumat hari kerja
+WEEKMASK = '1111100'
+
+_calendar = None
+_calendar_version = None
+
+
+def holiday_dates():
+    """Semua tanggal libur/cuti bersama dari kalender kebijakan sebagai array datetime64[D] (urut)."""
+    return policy_calendar().holiday_dates()
+
+
+def business_calendar():
+    """np.busdaycalendar (Senin–Jumat dikurangi hari libur); dibuat ulang hanya jika config kalender berubah."""
+    global _calendar, _calendar_version
+    version = policy_version()
+    if _calendar is None or version != _calendar_version:
+        _calendar = np.busdaycalendar(weekmask=WEEKMASK, holidays=holiday_dates())
+        _calendar_version = version
+    return _calendar
+
+
+def _to_day_array(values):
+    return np.asarray(pd.to_datetime(values), dtype='datetime64[D]')
+
+
+def work_days_between(start, end):
+    """Jumlah hari kerja dari start s/d end (inklusif) dalam satu panggilan vektor.
+
+    start/end boleh skalar atau array/Series tanggal (broadcast). Rentang kosong (start > end) -> 0.
+    """
+    start_days = _to_day_array(start)
+    end_days = _to_day_array(end) + np.timedelta64(1, 'D')
+    counts = np.busday_count(start_days, end_days, busdaycal=business_calendar())
+    return np.maximum(counts, 0)
+
+
+def month_bounds(year, month):
+    """(tanggal pertama, tanggal terakhir) bulan sebagai Timestamp."""
+    return pd.Timestamp(year, month, 1), pd.Timestamp(year, month, monthrange(year, month)[1])
+
+
+def month_work_days(year, month):
+    """Hari kerja satu bulan penuh (Senin–Jumat, dikurangi hari libur)."""
+    return int(work_days_between(*month_bounds(year, month)))
+
+
+def employee_work_days(join_dates, period_start, period_end):
+    """Hari kerja per karyawan dalam periode, dihitung sejak Join Date jika karyawan masuk di tengah periode.
+
+    Join Date kosong (export tanpa kolom Join Date) -> periode penuh; masuk setelah periode berakhir -> 0.
+    """
+    period_start = pd.Timestamp(period_start)
+    joins = pd.to_datetime(pd.Series(join_dates, copy=False)).to_numpy(dtype='datetime64[D]')
+    starts = np.where(
+        np.isnat(joins) | (joins < np.datetime64(period_start.date(), 'D')),
+        np.datetime64(period_start.date(), 'D'),
+        joins,
+    )
+    return work_days_between(starts, period_end)
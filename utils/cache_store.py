@@ -0,0 +1,259 @@
+"""Cache kolumnar (Parquet) untuk frame bulanan yang sudah diproses"""
+import hashlib
+import json
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+import pyarrow.parquet as pq
+
+
+# Folder cache (relatif terhadap root project, sama seperti path CSV di MONTH_FILES)
+CACHE_DIR = os.environ.get('ABSENCE_CACHE_DIR', '.cache')
+PROCESSED_DIR = os.path.join(CACHE_DIR, 'processed')
+# Hasil worker precompute (Arrow IPC tanpa kompresi, dibaca lewat memory map)
+PRECOMPUTED_DIR = os.path.join(CACHE_DIR, 'precomputed')
+# Agregat yang dikeluarkan dari memori oleh FrameCache (per proses, dibersihkan saat proses mulai)
+SPILL_DIR = os.path.join(CACHE_DIR, 'spill', str(os.getpid()))
+
+
+def file_content_hash(path, chunk_size=1 << 20):
+    """SHA-1 isi file (dibaca per blok agar hemat memori)."""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(chunk_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def source_fingerprint(path):
+    """Sidik jari file sumber: ukuran, mtime dan hash isi."""
+    stat = os.stat(path)
+    return {
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'sha1': file_content_hash(path),
+    }
+
+
+def _tmp(path):
+    """Nama file sementara unik per proses & thread (UI dan worker precompute bisa menulis file yang sama)."""
+    return f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+
+def _cache_paths(name):
+    base = os.path.join(PROCESSED_DIR, name)
+    return base + '.parquet', base + '.json'
+
+
+def _hashes_path(name):
+    return os.path.join(PROCESSED_DIR, name + '.hashes.npy')
+
+
+def read_processed(name, fingerprint, pipeline_version):
+    """Baca frame hasil proses dari cache. None jika belum ada / sidik jari atau versi pipeline berbeda."""
+    data_path, meta_path = _cache_paths(name)
+    try:
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if meta.get('pipeline_version') != pipeline_version or meta.get('source') != fingerprint:
+        return None
+    try:
+        return _sorted_categories(pd.read_parquet(data_path))
+    except Exception:
+        return None
+
+
+def _sorted_categories(df):
+    """Kategori diurutkan seperti astype('category'): file hasil streaming menyatukan dictionary antar row group
+    sesuai urutan kemunculan, padahal urutan kategori menentukan urutan hasil groupby."""
+    for col in df.columns:
+        if isinstance(df[col].dtype, pd.CategoricalDtype) and not df[col].cat.categories.is_monotonic_increasing:
+            df[col] = df[col].cat.reorder_categories(df[col].cat.categories.sort_values())
+    return df
+
+
+def read_previous(name, pipeline_version):
+    """Cache lama untuk ingest inkremental: (frame, hash baris, sidik jari sumber) walaupun file sumber sudah berubah.
+
+    None jika belum ada cache, versi pipeline berbeda atau cache tidak menyimpan hash baris (mis. hasil streaming).
+    """
+    data_path, meta_path = _cache_paths(name)
+    try:
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        if meta.get('pipeline_version') != pipeline_version:
+            return None
+        hashes = np.load(_hashes_path(name))
+        df = _sorted_categories(pd.read_parquet(data_path))
+    except Exception:
+        return None
+    if len(hashes) != len(df):
+        return None
+    return df, hashes, meta.get('source')
+
+
+def write_processed(name, df, fingerprint, pipeline_version, row_hashes=None):
+    """Simpan frame hasil proses ke cache (atomic: tulis file sementara lalu rename).
+
+    row_hashes (opsional, sejajar baris df) disimpan untuk ingest inkremental berikutnya.
+    Gagal menulis cache tidak dianggap error — data tetap dipakai dari memori.
+    """
+    data_path, meta_path = _cache_paths(name)
+    hashes_path = _hashes_path(name)
+    try:
+        os.makedirs(PROCESSED_DIR, exist_ok=True)
+        # Hash lama dihapus dulu agar tidak pernah dipasangkan dengan frame baru jika proses terhenti di tengah
+        if os.path.exists(hashes_path):
+            os.remove(hashes_path)
+        df.to_parquet(_tmp(data_path), index=False)
+        os.replace(_tmp(data_path), data_path)
+        if row_hashes is not None:
+            with open(_tmp(hashes_path), 'wb') as f:
+                np.save(f, np.asarray(row_hashes, dtype=np.uint64))
+            os.replace(_tmp(hashes_path), hashes_path)
+        with open(_tmp(meta_path), 'w', encoding='utf-8') as f:
+            json.dump({'pipeline_version': pipeline_version, 'source': fingerprint}, f)
+        os.replace(_tmp(meta_path), meta_path)
+        return True
+    except Exception:
+        return False
+
+
+def _stream_schema(schema):
+    """Schema tetap untuk semua potongan: kolom dictionary (categorical) selalu dictionary<int32, string>.
+
+    Tiap potongan punya kategori sendiri (lebar index berbeda, kategori kosong terbaca sebagai double).
+    """
+    return pa.schema(
+        [
+            pa.field(field.name, pa.dictionary(pa.int32(), pa.large_string())) if pa.types.is_dictionary(field.type)
+            else field
+            for field in schema
+        ],
+        metadata=schema.metadata,
+    )
+
+
+def write_processed_chunks(name, frames, fingerprint, pipeline_version):
+    """Tulis frame hasil proses per potongan langsung ke cache (satu row group per potongan), tanpa menggabungkan
+    semua potongan di memori. Meta ditulis setelah potongan terakhir sehingga cache tidak pernah setengah jadi.
+
+    Berbeda dengan write_processed, error dilempar: pada mode streaming cache adalah satu-satunya hasil.
+    Mengembalikan jumlah baris yang ditulis.
+    """
+    data_path, meta_path = _cache_paths(name)
+    os.makedirs(PROCESSED_DIR, exist_ok=True)
+    if os.path.exists(_hashes_path(name)):
+        os.remove(_hashes_path(name))
+    writer = None
+    schema = None
+    rows = 0
+    try:
+        for frame in frames:
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            if writer is None:
+                schema = _stream_schema(table.schema)
+                writer = pq.ParquetWriter(_tmp(data_path), schema)
+            writer.write_table(table.cast(schema))
+            rows += len(frame)
+        if writer is None:
+            raise ValueError(f"Tidak ada baris data untuk '{name}'")
+        writer.close()
+        writer = None
+        os.replace(_tmp(data_path), data_path)
+        with open(_tmp(meta_path), 'w', encoding='utf-8') as f:
+            json.dump({'pipeline_version': pipeline_version, 'source': fingerprint, 'rows': rows}, f)
+        os.replace(_tmp(meta_path), meta_path)
+    finally:
+        if writer is not None:
+            writer.close()
+        if os.path.exists(_tmp(data_path)):
+            os.remove(_tmp(data_path))
+    return rows
+
+
+def _spill_path(name):
+    return os.path.join(SPILL_DIR, name + '.parquet')
+
+
+def write_spill(name, df):
+    """Tulis frame yang dikeluarkan dari memori ke SPILL_DIR (atomic). False jika gagal (frame cukup dibangun ulang)."""
+    path = _spill_path(name)
+    try:
+        os.makedirs(SPILL_DIR, exist_ok=True)
+        df.to_parquet(_tmp(path), index=False)
+        os.replace(_tmp(path), path)
+        return True
+    except Exception:
+        return False
+
+
+def read_spill(name):
+    """Frame hasil write_spill, None jika tidak ada / gagal dibaca."""
+    try:
+        return pd.read_parquet(_spill_path(name))
+    except Exception:
+        return None
+
+
+def remove_spill(name=None):
+    """Hapus satu file spill, atau seluruh SPILL_DIR proses ini jika name None."""
+    try:
+        if name is None:
+            for entry in os.listdir(SPILL_DIR):
+                os.remove(os.path.join(SPILL_DIR, entry))
+            os.rmdir(SPILL_DIR)
+        else:
+            os.remove(_spill_path(name))
+    except OSError:
+        pass
+
+
+def _precomputed_path(name, artifact, version):
+    # Versi data ada di nama file: pembaca tidak pernah mendapat artefak versi lain walaupun worker sedang menulis
+    digest = hashlib.sha1(version.encode('utf-8')).hexdigest()[:16]
+    return os.path.join(PRECOMPUTED_DIR, name, f'{artifact}-{digest}.arrow')
+
+
+def write_precomputed(name, artifact, df, version):
+    """Tulis artefak precompute (frame) untuk versi data sebagai file Arrow IPC tanpa kompresi (atomic)."""
+    path = _precomputed_path(name, artifact, version)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    feather.write_feather(df, _tmp(path), compression='uncompressed')
+    os.replace(_tmp(path), path)
+
+
+def read_precomputed(name, artifact, version):
+    """Artefak precompute untuk versi data, di-memory-map (kolom numerik tanpa salinan). None jika belum ada."""
+    try:
+        table = feather.read_table(_precomputed_path(name, artifact, version), memory_map=True)
+    except (OSError, pa.ArrowInvalid):
+        return None
+    return table.to_pandas(split_blocks=True)
+
+
+def has_precomputed(name, artifacts, version):
+    """True jika semua artefak sudah ada untuk versi data ini."""
+    return all(os.path.exists(_precomputed_path(name, artifact, version)) for artifact in artifacts)
+
+
+def prune_precomputed(name, version):
+    """Hapus artefak versi lain (file yang masih di-mmap proses UI tetap valid sampai ditutup)."""
+    folder = os.path.join(PRECOMPUTED_DIR, name)
+    digest = hashlib.sha1(version.encode('utf-8')).hexdigest()[:16]
+    try:
+        entries = os.listdir(folder)
+    except OSError:
+        return
+    for entry in entries:
+        if entry.endswith('.arrow') and not entry.endswith(f'-{digest}.arrow'):
+            try:
+                os.remove(os.path.join(folder, entry))
+            except OSError:
+                pass
@@ -0,0 +1,127 @@
+"""Katalog bulan otomatis dari folder data per tahun (2025/, 2026/, ...)"""
+import json
+import os
+import re
+import threading
+
+import pandas as pd
+
+from utils.cache_store import CACHE_DIR
+from utils.schemas import TALENTA_SCHEMAS, detect_schema, read_header, sniff_date_format
+
+
+# Folder data = folder di root project dengan nama tahun 4 digit
+DATA_ROOT = os.environ.get('ABSENCE_DATA_DIR', '.')
+CATALOG_PATH = os.path.join(CACHE_DIR, 'catalog.json')
+# Naikkan jika isi entri katalog berubah agar index lama di-scan ulang
+CATALOG_VERSION = 1
+
+BULAN_ID = [
+    'Januari', 'Februari', 'Maret', 'April', 'Mei', 'Juni',
+    'Juli', 'Agustus', 'September', 'Oktober', 'November', 'Desember',
+]
+
+
+def _data_files():
+    """Path semua CSV di folder tahun (mis. '2025/maret.csv'), urut nama."""
+    files = []
+    for entry in sorted(os.listdir(DATA_ROOT)):
+        folder = os.path.join(DATA_ROOT, entry)
+        if re.fullmatch(r'\d{4}', entry) and os.path.isdir(folder):
+            for name in sorted(os.listdir(folder)):
+                if name.lower().endswith('.csv'):
+                    files.append(os.path.normpath(os.path.join(folder, name)))
+    return files
+
+
+def _scan_file(path):
+    """Pass cepat satu file: header (varian skema) + kolom Employee ID & Date saja."""
+    schema_name = detect_schema(read_header(path))
+    columns = TALENTA_SCHEMAS[schema_name]['columns']
+    raw_id = next(raw for raw, canonical in columns.items() if canonical == 'Employee ID')
+    raw_date = next(raw for raw, canonical in columns.items() if canonical == 'Date')
+    sample = pd.read_csv(path, encoding='utf-8-sig', usecols=[raw_id, raw_date], dtype=str)
+    ids = pd.to_numeric(sample[raw_id], errors='coerce')
+    valid = ids.notna()
+    date_format = sniff_date_format(path, raw_date, TALENTA_SCHEMAS[schema_name]['date_formats'])
+    dates = pd.to_datetime(sample.loc[valid, raw_date], format=date_format, errors='coerce').dropna()
+    if dates.empty:
+        raise ValueError(f"Tidak ada tanggal valid di {path}")
+    # Bulan dominan menentukan key katalog (export bisa memuat 1–2 hari dari bulan tetangga)
+    period = dates.dt.to_period('M').mode()[0]
+    return {
+        'key': f"{period.year:04d}-{period.month:02d}",
+        'label': f"{BULAN_ID[period.month - 1]} {period.year}",
+        'schema': schema_name,
+        'date_min': dates.min().strftime('%Y-%m-%d'),
+        'date_max': dates.max().strftime('%Y-%m-%d'),
+        'rows': int(valid.sum()),
+        'employees': int(ids[valid].nunique()),
+    }
+
+
+def _load_index():
+    try:
+        with open(CATALOG_PATH, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+        if index.get('version') == CATALOG_VERSION:
+            return index.get('files', {})
+    except (OSError, ValueError):
+        pass
+    return {}
+
+
+def _save_index(files):
+    try:
+        os.makedirs(os.path.dirname(CATALOG_PATH), exist_ok=True)
+        # Nama tmp unik per thread: scan bisa berjalan bersamaan (halaman + pemantau file sumber)
+        tmp_path = f"{CATALOG_PATH}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': CATALOG_VERSION, 'files': files}, f, indent=1)
+        os.replace(tmp_path, CATALOG_PATH)
+    except OSError:
+        pass
+
+
+def scan_catalog():
+    """Daftar entri katalog (urut kronologis). File yang ukuran & mtime-nya sama dengan index tersimpan tidak dibaca ulang.
+
+    Tiap entri: key ('YYYY-MM'), label, path, schema, date_min, date_max, rows, employees, size, mtime_ns.
+    Jika dua file jatuh ke bulan yang sama, file yang paling baru (mtime) dipakai.
+    """
+    cached = _load_index()
+    files = {}
+    for path in _data_files():
+        try:
+            stat = os.stat(path)
+        except OSError:
+            # File dihapus/dipindah saat scan
+            continue
+        entry = cached.get(path)
+        if not entry or entry.get('size') != stat.st_size or entry.get('mtime_ns') != stat.st_mtime_ns:
+            try:
+                entry = _scan_file(path)
+            except Exception:
+                # File yang bukan export Talenta / rusak dilewati, tidak menggagalkan katalog
+                continue
+            entry.update({'path': path, 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns})
+        files[path] = entry
+    if files != cached:
+        _save_index(files)
+
+    by_month = {}
+    for entry in files.values():
+        current = by_month.get(entry['key'])
+        if current is None or entry['mtime_ns'] > current['mtime_ns']:
+            by_month[entry['key']] = entry
+    return [by_month[key] for key in sorted(by_month)]
+
+
+def month_files():
+    """Dict key bulan -> path CSV (urut kronologis), pengganti daftar MONTH_FILES manual."""
+    return {entry['key']: entry['path'] for entry in scan_catalog()}
+
+
+def month_labels():
+    """Dict key bulan -> label tampilan (mis. 'Januari 2026')."""
+    return {entry['key']: entry['label'] for entry in scan_catalog()}
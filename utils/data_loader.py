@@ -1,225 +1,498 @@
 """Data loading and processing utilities"""
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
 import pandas as pd
 import streamlit as st
 
-from utils.calculations import get_work_days_holidays, get_check_out_minimum_minutes, is_ramadan_adjusted_hours_2026
-
-
-# Map bulan ke nama file CSV
-# 2025: Maret–Desember, 2026: Januari dst. (tambah key + path CSV jika ada file baru)
-MONTH_FILES = {
-    # 2025 - nama file bahasa Indonesia
-    '2025-03': '2025/maret.csv',
-    '2025-04': '2025/april.csv',
-    '2025-05': '2025/mei.csv',
-    '2025-06': '2025/juni.csv',
-    '2025-07': '2025/juli.csv',
-    '2025-08': '2025/agustus.csv',
-    '2025-09': '2025/september.csv',
-    '2025-10': '2025/oktober.csv',
-    '2025-11': '2025/november.csv',
-    '2025-12': '2025/desember.csv',
-    'january': '2026/january.csv',   # Januari 2026
-    'february': '2026/february.csv', # Februari 2026
-    'march': '2026/maret.csv',       # Maret 2026 (nama file: maret.csv)
+from utils.cache_store import (
+    source_fingerprint, read_processed, read_previous, write_processed, write_processed_chunks, read_precomputed,
+)
+from utils.policy_calendar import resolve_date_policy, policy_version
+from utils.schedule_policy import resolve_schedule_policy, shift_relative_minutes, schedule_policy, schedule_policy_version
+from utils.shift_intervals import worked_minutes, pair_next_day_check_out, DEFAULT_PAIR_WINDOW_MINUTES
+from utils.catalog import month_files, scan_catalog
+from utils.schemas import read_talenta_csv, iter_talenta_csv
+from utils.filter_index import FilterIndex
+from utils.incremental import PatchPlan, row_hashes
+from utils.single_flight import SingleFlight
+from utils.frame_cache import frame_cache
+from utils.frame_layout import compact_frame, concat_frames
+from utils.time_parser import to_minutes, minutes_to_hours, minutes_to_hhmm, minutes_array, parse_duration_columns
+
+
+# Map bulan ('YYYY-MM') ke path CSV, diisi dari katalog folder data (utils/catalog.py).
+# File export baru di 2025/, 2026/, ... otomatis muncul tanpa perubahan kode.
+MONTH_FILES = month_files()
+
+# MONTH_FILES dibaca thread prewarm/watcher dan diganti refresh_month_catalog: semua akses lewat lock ini
+# (catalog_months, has_month, month_path) agar pembaca tidak pernah melihat katalog kosong/setengah jadi
+_catalog_lock = threading.RLock()
+
+# Key lama sebelum ada katalog (session/bookmark lama) tetap diterima
+MONTH_ALIASES = {
+    'january': '2026-01',
+    'february': '2026-02',
+    'march': '2026-03',
 }
 
+# Bulan default (Januari 2026) dan baseline Total Karyawan di Dashboard
+DEFAULT_MONTH = '2026-01'
+BASELINE_MONTH = '2026-01'
+
 # Nama karyawan yang dikecualikan dari analisis (mis. Direktur)
 EXCLUDED_EMPLOYEE_NAMES = {'Sumardi', 'Henri Hendriansah', 'Iwan'}
 # Posisi jabatan yang dikecualikan dari dropdown Pilih Karyawan & analisis (mis. Direktur)
 EXCLUDED_JOB_POSITIONS = {'Direktur'}
 
+# Export sebesar ini atau lebih diproses secara streaming (potongan STREAM_CHUNK_ROWS baris) langsung ke cache Parquet
+STREAM_THRESHOLD_BYTES = int(float(os.environ.get('ABSENCE_STREAM_THRESHOLD_MB', '32')) * 1024 * 1024)
+STREAM_CHUNK_ROWS = 50000
 
-@st.cache_data
-def load_data(month='january'):
-    """Load dan clean data dari CSV. Parameter month mengacu ke key di MONTH_FILES."""
-    try:
-        # Default fallback ke Januari 2026 jika key tidak dikenal
-        filename = MONTH_FILES.get(month, MONTH_FILES['january'])
-        df = pd.read_csv(filename)
-
-        # Normalisasi nama kolom (hilangkan spasi dan tanda * di akhir seperti 'Employee ID*', 'Date*', dst.)
-        df.columns = (
-            df.columns
-            .str.strip()
-            .str.replace('*', '', regex=False)
-        )
-
-        # Simpan daftar kolom asli (setelah normalisasi) sebelum menambah kolom default
-        original_time_cols = set(df.columns)
-
-        # Pastikan kolom waktu yang dipakai di pipeline selalu ada
-        for col in ['Real Working Hour', 'Actual Working Hour', 'Late In', 'Early Out']:
-            if col not in df.columns:
-                df[col] = '00:00'
-        
-        # Filter baris yang bukan TOTAL (baris yang berisi "TOTAL FOR EMPLOYEE")
-        df = df[~df['Employee ID'].astype(str).str.contains('TOTAL', na=False)]
-        
-        # Filter baris yang memiliki Employee ID valid (numeric)
-        df = df[pd.to_numeric(df['Employee ID'], errors='coerce').notna()]
-        
-        # Convert Employee ID ke integer
-        df['Employee ID'] = df['Employee ID'].astype(int)
-        
-        # Convert Date ke datetime
-        df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
-        
-        # Parse waktu kerja (format HH:MM ke jam desimal)
-        def parse_time_to_hours(time_str):
-            """Convert waktu format HH:MM ke jam desimal"""
-            if pd.isna(time_str) or time_str == '' or time_str == '00:00':
-                return 0.0
-            try:
-                parts = str(time_str).split(':')
-                if len(parts) == 2:
-                    hours = int(parts[0])
-                    minutes = int(parts[1])
-                    return hours + (minutes / 60.0)
-                return 0.0
-            except:
-                return 0.0
-        
-        # Parse Late In dan Early Out
-        def parse_late_early(time_str):
-            """Check apakah ada late in atau early out (bukan 00:00)"""
-            if pd.isna(time_str) or time_str == '' or time_str == '00:00':
-                return False
-            try:
-                parts = str(time_str).split(':')
-                if len(parts) == 2:
-                    hours = int(parts[0])
-                    minutes = int(parts[1])
-                    return hours > 0 or minutes > 0
-                return False
-            except:
-                return False
-        
-        # Apply parsing
-        # Jika data punya kolom 'Real Working Hour', gunakan itu.
-        # Jika tidak (seperti data 2025), hitung jam kerja dari selisih Check In dan Check Out.
-        if 'Real Working Hour' in original_time_cols:
-            df['Real Working Hour Decimal'] = df['Real Working Hour'].apply(parse_time_to_hours)
-        else:
-            df['Real Working Hour Decimal'] = df.apply(
-                lambda row: max(
-                    0.0,
-                    parse_time_to_hours(row.get('Check Out')) - parse_time_to_hours(row.get('Check In'))
-                ),
-                axis=1
-            )
+# Load bulan yang sedang berjalan per (bulan, versi data): sesi/thread lain ikut menunggu, tidak memproses ulang
+_month_loads = SingleFlight('load_month')
 
-        if 'Actual Working Hour' in original_time_cols:
-            df['Actual Working Hour Decimal'] = df['Actual Working Hour'].apply(parse_time_to_hours)
-        else:
-            # Jika tidak ada kolom Actual, gunakan nilai Real sebagai proxy
-            df['Actual Working Hour Decimal'] = df['Real Working Hour Decimal']
-
-        # Puasa 2026: Feb 19–28 & Mar 1–17 — tambah 30 menit ke Jam Kerja (Real/Actual) (penyesuaian istirahat)
-        def _decimal_to_hhmm(h):
-            """Jam desimal ke string HH:MM."""
-            if pd.isna(h):
-                return '00:00'
-            h_int = int(h)
-            m = round((h - h_int) * 60)
-            if m >= 60:
-                h_int += 1
-                m = 0
-            return f"{h_int:02d}:{m:02d}"
-
-        ramadan_mask = df['Date'].apply(is_ramadan_adjusted_hours_2026)
-        if ramadan_mask.any():
-            df.loc[ramadan_mask, 'Real Working Hour Decimal'] = df.loc[ramadan_mask, 'Real Working Hour Decimal'] + 0.5
-            df.loc[ramadan_mask, 'Actual Working Hour Decimal'] = df.loc[ramadan_mask, 'Actual Working Hour Decimal'] + 0.5
-
-        # Export tanpa kolom Real/Actual (mis. maret.csv): jam dihitung dari Check In/Out → isi string HH:MM untuk SEMUA baris.
-        # Sebelumnya hanya baris puasa yang disinkronkan, sehingga tgl 25–31 Maret (dst.) tetap 00:00 / tampak kosong.
-        if 'Real Working Hour' not in original_time_cols:
-            df['Real Working Hour'] = df['Real Working Hour Decimal'].apply(_decimal_to_hhmm)
-            df['Actual Working Hour'] = df['Actual Working Hour Decimal'].apply(_decimal_to_hhmm)
-        elif ramadan_mask.any():
-            df.loc[ramadan_mask, 'Real Working Hour'] = df.loc[ramadan_mask, 'Real Working Hour Decimal'].apply(_decimal_to_hhmm)
-            if 'Actual Working Hour' in df.columns:
-                df.loc[ramadan_mask, 'Actual Working Hour'] = df.loc[ramadan_mask, 'Actual Working Hour Decimal'].apply(_decimal_to_hhmm)
-
-        df['Late In Decimal'] = df['Late In'].apply(parse_time_to_hours)
-        df['Early Out Decimal'] = df['Early Out'].apply(parse_time_to_hours)
-        df['Is Late In'] = df['Late In'].apply(parse_late_early)
-        df['Is Early Out'] = df['Early Out'].apply(parse_late_early)
-
-        # Early Out by rule: puasa (Feb 19–28, Mar 1–17 2026) pulang < 16:00; setelah lebaran / normal < 17:00
-        df['_co_min'] = df['Check Out'].apply(time_to_minutes)
-        df['_co_threshold'] = df['Date'].apply(get_check_out_minimum_minutes)
-        has_co = df['_co_min'].notna()
-        is_early_by_rule = has_co & (df['_co_min'] < df['_co_threshold'])
-        df.loc[has_co, 'Is Early Out'] = is_early_by_rule[has_co]
-        def _early_out_decimal(r):
-            if r['_co_min'] is not None and r['_co_min'] < r['_co_threshold']:
-                return (r['_co_threshold'] - r['_co_min']) / 60.0
-            if r['_co_min'] is not None:
-                return 0.0
-            return r['Early Out Decimal']
-        df['Early Out Decimal'] = df.apply(_early_out_decimal, axis=1)
-        df = df.drop(columns=['_co_min', '_co_threshold'], errors='ignore')
-
-        # Tentukan apakah hadir (ada Check In atau Attendance Code = 'H')
-        df['Is Present'] = (
-            (df['Check In'].notna() & (df['Check In'] != '')) |
-            (df['Attendance Code'] == 'H')
-        )
-        
-        # Tentukan kategori status
-        # Hari libur: Shift = 'dayoff' + hari libur yang dikonfigurasi (mis. list hari libur per bulan)
-        if df['Date'].notna().any():
-            year_mode = int(df['Date'].dt.year.mode()[0])
-            month_mode = int(df['Date'].dt.month.mode()[0])
-            holiday_days = set(get_work_days_holidays(year_mode, month_mode))
-            is_holiday_config = df['Date'].dt.day.isin(holiday_days)
-        else:
-            is_holiday_config = False
-
-        df['Is Dayoff'] = df['Shift'].str.contains('dayoff', case=False, na=False) | is_holiday_config
-        
-        # Sakit: Attendance Code = 'S' atau Time Off Code = 'S'
-        df['Is Sick'] = (
-            (df['Attendance Code'] == 'S') |
-            (df['Time Off Code'] == 'S')
-        )
-        
-        # Cuti / izin (tidak termasuk sakit):
-        # - Attendance Code = 'CT' (Cuti)
-        # - Time Off Code = 'CT'
-        # - Attendance Code = 'CPD' (Cuti Perjalanan Dinas)
-        # - Time Off Code = 'CPD'
-        # - Shift mengandung 'Roster Leave'
-        df['Is Leave'] = (
-            (df['Attendance Code'] == 'CT') |
-            (df['Time Off Code'] == 'CT') |
-            (df['Attendance Code'] == 'CPD') |
-            (df['Time Off Code'] == 'CPD') |
-            (df['Shift'].str.contains('Roster Leave', case=False, na=False))
-        )
-        
-        # Tidak hadir (absen): bukan hadir, bukan cuti, bukan sakit, bukan hari libur
-        df['Is Absent'] = (
-            (~df['Is Present']) &
-            (~df['Is Leave']) &
-            (~df['Is Sick']) &
-            (~df['Is Dayoff'])
-        )
-        
-        return df
-    except FileNotFoundError:
-        st.error(f"File data tidak ditemukan: {filename}. Pastikan file ada di folder project.")
+# Patch inkremental terakhir per bulan: bulan -> (versi data sebelum patch, Employee ID yang berubah)
+_month_patches = {}
+
+# Versi pipeline proses (parse/flag). Naikkan setiap kali logika process_month berubah
+# agar cache Parquet lama di .cache/processed otomatis dianggap basi.
+PIPELINE_VERSION = 10
+
+
+def refresh_month_catalog():
+    """Scan ulang katalog (murah: hanya stat file kecuali ada file baru/berubah) dan perbarui MONTH_FILES.
+
+    Mengembalikan dict key bulan -> label untuk selector bulan.
+    """
+    entries = scan_catalog()
+    files = {entry['key']: entry['path'] for entry in entries}
+    with _catalog_lock:
+        # Diganti hanya jika katalog berubah (urutan kronologis ikut dipertahankan)
+        if list(files.items()) != list(MONTH_FILES.items()):
+            MONTH_FILES.clear()
+            MONTH_FILES.update(files)
+    return {entry['key']: entry['label'] for entry in entries}
+
+
+def catalog_months():
+    """Salinan key MONTH_FILES (urut kronologis) yang konsisten walau katalog sedang di-refresh thread lain."""
+    with _catalog_lock:
+        return list(MONTH_FILES)
+
+
+def has_month(month):
+    """True jika key bulan ada di katalog saat ini."""
+    with _catalog_lock:
+        return month in MONTH_FILES
+
+
+def month_path(month):
+    """Path CSV untuk key bulan (KeyError jika tidak ada di katalog)."""
+    with _catalog_lock:
+        return MONTH_FILES[month]
+
+
+def resolve_month(month):
+    """Key bulan valid di MONTH_FILES: alias lama diterjemahkan, key tidak dikenal jatuh ke DEFAULT_MONTH."""
+    month = MONTH_ALIASES.get(month, month)
+    months = catalog_months()
+    if month in months:
+        return month
+    if DEFAULT_MONTH in months:
+        return DEFAULT_MONTH
+    if months:
+        return months[-1]
+    raise FileNotFoundError("Tidak ada file data di folder tahun (2025/, 2026/, ...)")
+
+
+def _version_key(size, mtime_ns):
+    return f"{size}-{mtime_ns}-{PIPELINE_VERSION}-{policy_version()}-{schedule_policy_version()}"
+
+
+def data_version(month):
+    """Versi data bulan untuk key cache turunan: ukuran + mtime file sumber + PIPELINE_VERSION + versi config kebijakan."""
+    stat = os.stat(month_path(resolve_month(month)))
+    return _version_key(stat.st_size, stat.st_mtime_ns)
+
+
+def frame_version(df):
+    """Versi data (data_version) frame hasil load_data, None untuk frame dari sumber lain."""
+    return df.attrs.get('data_version')
+
+
+def load_data(month=DEFAULT_MONTH):
+    """Load dan clean data dari CSV. Parameter month mengacu ke key di MONTH_FILES.
+
+    Cache dikunci per (bulan, versi data): file sumber yang diganti langsung terbaca tanpa restart server.
+    """
+    month = resolve_month(month)
+    return load_data_version(month, data_version(month))
+
+
+def load_data_version(month, version):
+    """load_data untuk versi data tertentu. Frame dari FrameCache (objek bersama, read-only), attrs['data_version'] = version."""
+    try:
+        return frame_cache().get(('frame', month, version), lambda: _versioned_frame(month, version))
+    except FileNotFoundError as e:
+        st.error(f"File data tidak ditemukan: {e.filename or e}. Pastikan file ada di folder project.")
         return None
     except Exception as e:
         st.error(f"Error loading data: {str(e)}")
         return None
 
 
-def filter_data(df, branch, org):
-    """Filter data berdasarkan branch dan organization. Mengecualikan nama di EXCLUDED_EMPLOYEE_NAMES dan posisi di EXCLUDED_JOB_POSITIONS (mis. Direktur)."""
-    filtered_df = df[df['Branch'] == branch].copy()
+def _versioned_frame(month, version):
+    # Hasil worker precompute (file Arrow di-mmap) jika sudah ada untuk versi ini, selain itu proses di sini
+    df = read_precomputed(month, 'frame', version)
+    if df is None:
+        df = load_month(month)
+    df.attrs['data_version'] = version
+    return df
+
+
+def load_month(month=DEFAULT_MONTH):
+    """Frame bulan yang sudah diproses: dari cache Parquet jika sumber & versi pipeline sama, jika tidak proses ulang CSV.
+
+    Tidak memakai st.* sehingga aman dipanggil di luar script Streamlit. Error dilempar ke pemanggil.
+    Panggilan bersamaan untuk (bulan, versi data) yang sama menunggu satu proses yang sedang berjalan (hasilnya
+    frame yang sama: jangan diubah di tempat).
+    """
+    month = resolve_month(month)
+    return _month_loads.do((month, data_version(month)), _load_month, month)
+
+
+def _load_month(month):
+    filename = month_path(month)
+    fingerprint = source_fingerprint(filename)
+    # Hasil proses bergantung pada kalender & kebijakan jadwal: config yang diedit membuat cache lama basi
+    version = f"{PIPELINE_VERSION}:{policy_version()}:{schedule_policy_version()}"
+    df = read_processed(month, fingerprint, version)
+    if df is None:
+        if os.path.getsize(filename) >= STREAM_THRESHOLD_BYTES:
+            # Export besar (setahun / gabungan branch): proses per potongan langsung ke cache, lalu baca hasil kompaknya
+            write_processed_chunks(month, iter_processed_chunks(filename), fingerprint, version)
+            df = read_processed(month, fingerprint, version)
+        else:
+            # Export ulang bulan berjalan: hanya baris baru/berubah yang diproses, sisanya dari cache lama
+            df, hashes, _ = process_incremental(month, filename, version)
+            write_processed(month, df, fingerprint, version, row_hashes=hashes)
+    return df
+
+
+def months_between(start, end):
+    """Key MONTH_FILES dari start s/d end (inklusif, urutan kronologis MONTH_FILES).
+
+    KeyError jika bulan tidak ada di katalog, ValueError jika start setelah end (argumen tertukar).
+    """
+    keys = catalog_months()
+    start, end = MONTH_ALIASES.get(start, start), MONTH_ALIASES.get(end, end)
+    for key in (start, end):
+        if key not in keys:
+            raise KeyError(f"Bulan tidak dikenal: {key}")
+    i, j = keys.index(start), keys.index(end)
+    if i > j:
+        raise ValueError(f"Rentang bulan terbalik: {start} setelah {end}")
+    return keys[i:j + 1]
+
+
+def load_range(start, end, max_workers=None):
+    """Load & proses beberapa bulan sekaligus secara paralel (thread pool), hasil satu frame dengan kolom 'Period'.
+
+    Tiap bulan lewat load_month sehingga cache Parquet per bulan dipakai ulang. 'Period' berisi key MONTH_FILES
+    (categorical berurutan) sehingga frame bisa dipartisi/di-groupby per bulan.
+    """
+    months = months_between(start, end)
+    workers = max_workers or min(len(months), os.cpu_count() or 4)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        frames = list(pool.map(load_month, months))
+    return concat_frames(frames, months, key_column='Period')
+
+
+def process_month(filename):
+    """Baca CSV Talenta dan jalankan seluruh pipeline parse/flag (tanpa cache)."""
+    # Reader bertipe per varian export (lihat utils/schemas.py): usecols/dtype eksplisit, nama kolom kanonik, Date sudah datetime
+    df, schema_name = read_talenta_csv(filename)
+    return process_frame(df)
+
+
+def iter_processed_chunks(filename, chunk_rows=STREAM_CHUNK_ROWS):
+    """Pipeline process_frame per potongan CSV (generator frame kompak), memori sebanding chunk_rows, bukan ukuran file.
+
+    Potongan dipotong di batas karyawan: baris karyawan terakhir di potongan dibawa ke potongan berikutnya, karena
+    pairing shift malam membutuhkan baris hari berikutnya dari karyawan yang sama. Urutan baris sama dengan process_month.
+    """
+    carry = None
+    for chunk, _ in iter_talenta_csv(filename, chunk_rows):
+        if carry is not None:
+            chunk = pd.concat([carry, chunk], ignore_index=True)
+            carry = None
+        # Baris TOTAL (ID bukan angka) ikut karyawan sebelumnya
+        ids = pd.to_numeric(chunk['Employee ID'], errors='coerce').ffill().to_numpy()
+        if np.isnan(ids[-1]):
+            continue
+        changes = np.flatnonzero(ids != ids[-1])
+        boundary = changes[-1] + 1 if len(changes) else 0
+        if boundary:
+            yield process_frame(chunk.iloc[:boundary].copy())
+        carry = chunk.iloc[boundary:]
+    if carry is not None:
+        yield process_frame(carry.copy())
+
+
+def valid_employee_rows(df):
+    """Mask baris karyawan: bukan baris 'TOTAL FOR EMPLOYEE' dan Employee ID numerik."""
+    ids = df['Employee ID']
+    not_total = ~ids.astype(str).str.contains('TOTAL', na=False)
+    return (not_total & pd.to_numeric(ids, errors='coerce').notna()).to_numpy()
+
+
+def process_incremental(month, filename, version):
+    """Proses export bulan; jika ada cache lama (versi pipeline sama) hanya baris baru/berubah yang diproses ulang.
+
+    Baris dicocokkan per (Employee ID, Date) lewat hash isi baris mentah (utils/incremental.py). Mengembalikan
+    (frame, hash baris, PatchPlan atau None jika diproses penuh).
+    """
+    raw, _ = read_talenta_csv(filename)
+    raw = raw[valid_employee_rows(raw)].reset_index(drop=True)
+    hashes = row_hashes(raw)
+    previous = read_previous(month, version)
+    if previous is None or previous[0].empty or raw.empty:
+        return process_frame(raw), hashes, None
+    cached, cached_hashes, source = previous
+    plan = PatchPlan(
+        cached['Employee ID'], cached['Date'], cached_hashes,
+        pd.to_numeric(raw['Employee ID']), raw['Date'], hashes,
+    )
+    if plan.recompute.all():
+        return process_frame(raw), hashes, None
+    df = plan.apply(cached, raw, process_frame)
+    if source:
+        # Catat patch untuk agregat turunan (cube bulan): versi data lama -> baru, karyawan yang berubah
+        _month_patches[month] = (_version_key(source['size'], source['mtime_ns']), plan.employees)
+    return df, hashes, plan
+
+
+def month_patch(month, base_version):
+    """Employee ID yang berubah sejak versi data base_version (patch inkremental terakhir bulan ini), atau None."""
+    patch = _month_patches.get(resolve_month(month))
+    if patch is None or patch[0] != base_version:
+        return None
+    return patch[1]
+
+
+def process_frame(df):
+    """Pipeline parse/flag untuk frame export bertipe (hasil read_talenta_csv / iter_talenta_csv)."""
+    # Simpan daftar kolom asli sebelum menambah kolom default
+    original_time_cols = set(df.columns)
+
+    # Pastikan kolom waktu yang dipakai di pipeline selalu ada
+    for col in ['Real Working Hour', 'Actual Working Hour', 'Late In', 'Early Out']:
+        if col not in df.columns:
+            df[col] = '00:00'
+    
+    # Filter baris yang bukan TOTAL dan memiliki Employee ID valid (numeric)
+    df = df[valid_employee_rows(df)]
+    
+    # Convert Employee ID ke integer
+    df['Employee ID'] = df['Employee ID'].astype(int)
+
+    # Join Date (hanya export 2025) untuk hari kerja prorata karyawan baru; export tanpa kolom ini -> NaT (bulan penuh)
+    if 'Join Date' in df.columns:
+        df['Join Date'] = pd.to_datetime(df['Join Date'], format='%Y-%m-%d', errors='coerce')
+    else:
+        df['Join Date'] = pd.NaT
+
+    # Kebijakan per tanggal (batas masuk/pulang, penyesuaian jam puasa, hari libur) dari config/policy_calendar.json:
+    # satu lookup interval vektor untuk semua baris, berlaku untuk tahun mana pun yang ada di config
+    date_policy = resolve_date_policy(df['Date'])
+
+    # Batas masuk/pulang per baris (config/schedule_policy.json): shift kalender (Office) -> aturan tanggal/puasa,
+    # shift berjadwal (mis. Senyiur Pagi 06:00–18:00, Malam 18:00–06:00) -> jadwal shift + grace
+    schedule = resolve_schedule_policy(df, date_policy)
+    for col in schedule.columns:
+        df[col] = schedule[col]
+    
+    # Parse waktu kerja (format H:MM / HH:MM / HH:MM:SS ke menit, vektor — lihat utils/time_parser.py)
+    # Jika data punya kolom 'Real Working Hour', gunakan itu.
+    # Jika tidak (seperti data 2025), hitung durasi Check In -> Check Out dalam menit; Check Out lebih awal dari
+    # Check In = hari berikutnya (shift malam 18:00 -> 06:00 = 12 jam). Opsional (pair_next_day_check_out di
+    # config jadwal): shift malam tanpa Check Out dipasangkan dengan jam pagi di baris hari berikutnya.
+    if 'Real Working Hour' in original_time_cols:
+        df['Real Working Hour Decimal'] = minutes_to_hours(to_minutes(df['Real Working Hour']))
+    else:
+        check_in_minutes, check_out_minutes = to_minutes(df['Check In']), to_minutes(df['Check Out'])
+        worked = worked_minutes(check_in_minutes, check_out_minutes)
+        policy = schedule_policy()
+        if policy.get('pair_next_day_check_out'):
+            paired = pair_next_day_check_out(
+                df['Employee ID'], df['Date'], check_in_minutes, check_out_minutes,
+                df['Is Overnight Shift'], df['Check Out Minimum Minutes'],
+                window=policy.get('pair_window_minutes', DEFAULT_PAIR_WINDOW_MINUTES),
+            )
+            worked = worked.fillna(pd.Series(paired, index=df.index).astype('Int32'))
+        df['Real Working Hour Decimal'] = minutes_to_hours(worked)
+
+    if 'Actual Working Hour' in original_time_cols:
+        df['Actual Working Hour Decimal'] = minutes_to_hours(to_minutes(df['Actual Working Hour']))
+    else:
+        # Jika tidak ada kolom Actual, gunakan nilai Real sebagai proxy
+        df['Actual Working Hour Decimal'] = df['Real Working Hour Decimal']
+
+    # Periode puasa: tambah hour_adjustment_minutes (mis. 30 menit) ke Jam Kerja (Real/Actual) (penyesuaian istirahat)
+    adjustment_hours = date_policy['Hour Adjustment Minutes'] / 60.0
+    adjusted_mask = adjustment_hours > 0
+    if adjusted_mask.any():
+        df.loc[adjusted_mask, 'Real Working Hour Decimal'] = df.loc[adjusted_mask, 'Real Working Hour Decimal'] + adjustment_hours[adjusted_mask]
+        df.loc[adjusted_mask, 'Actual Working Hour Decimal'] = df.loc[adjusted_mask, 'Actual Working Hour Decimal'] + adjustment_hours[adjusted_mask]
+
+    # Export tanpa kolom Real/Actual (mis. maret.csv): jam dihitung dari Check In/Out → isi string HH:MM untuk SEMUA baris.
+    # Sebelumnya hanya baris puasa yang disinkronkan, sehingga tgl 25–31 Maret (dst.) tetap 00:00 / tampak kosong.
+    if 'Real Working Hour' not in original_time_cols:
+        df['Real Working Hour'] = minutes_to_hhmm(df['Real Working Hour Decimal'] * 60)
+        df['Actual Working Hour'] = minutes_to_hhmm(df['Actual Working Hour Decimal'] * 60)
+    elif adjusted_mask.any():
+        df.loc[adjusted_mask, 'Real Working Hour'] = minutes_to_hhmm(df.loc[adjusted_mask, 'Real Working Hour Decimal'] * 60)
+        if 'Actual Working Hour' in df.columns:
+            df.loc[adjusted_mask, 'Actual Working Hour'] = minutes_to_hhmm(df.loc[adjusted_mask, 'Actual Working Hour Decimal'] * 60)
+
+    # Late In / Early Out: menit + flag > 0 dalam satu pass
+    durations = parse_duration_columns(df, ['Late In', 'Early Out'])
+    late_minutes, df['Is Late In'] = durations['Late In']
+    early_minutes, df['Is Early Out'] = durations['Early Out']
+    df['Late In Decimal'] = minutes_to_hours(late_minutes)
+    df['Early Out Decimal'] = minutes_to_hours(early_minutes)
+
+    # Semua perbandingan relatif ke tanggal mulai shift (shift malam: Check Out pagi = hari berikutnya)
+    df['Check In Minutes'] = to_minutes(df['Check In'])
+    df['Check Out Minutes'] = to_minutes(df['Check Out'])
+    check_in_minutes = minutes_array(to_minutes(df['Check In'], zero_as_missing=True))
+    check_in_rel, check_out_rel, minimum_rel, mismatch = shift_relative_minutes(
+        check_in_minutes,
+        minutes_array(df['Check Out Minutes']),
+        minutes_array(df['Schedule In Minutes']),
+        df['Check Out Minimum Minutes'].to_numpy(dtype=float),
+        df['Is Overnight Shift'].to_numpy(),
+    )
+
+    # Late In by rule untuk export tanpa kolom Late In (format 2025): terlambat jika Check In melewati batas masuk yang
+    # sama dengan flag on time (jam masuk + grace / kalender), durasi dihitung dari jam masuk jadwal (lihat late_in_by_rule).
+    # Export 2026 tetap memakai Late In dari export.
+    deadline = df['Check In Deadline Minutes'].to_numpy(dtype=float)
+    if 'Late In' not in original_time_cols:
+        late = late_in_by_rule(check_in_rel, minutes_array(df['Schedule In Minutes']), deadline)
+        df['Is Late In'] = late > 0
+        df['Late In Decimal'] = late / 60.0
+        df['Late In'] = minutes_to_hhmm(pd.Series(late, index=df.index))
+
+    # Early Out by rule: Check Out sebelum batas pulang (jadwal shift / kalender: puasa 16:00, normal 17:00)
+    # Array bermask: baris dengan Check Out -> aturan batas pulang; tanpa Check Out / tidak cocok jadwal -> tetap nilai Early Out dari export
+    df['Is Early Out'], df['Early Out Decimal'] = early_out_by_rule(
+        check_out_rel,
+        minimum_rel,
+        df['Is Early Out'].to_numpy(),
+        df['Early Out Decimal'].to_numpy(),
+    )
+
+    # Flag compliance jam masuk/pulang per baris (dipakai Checklist Compliance & Detail Karyawan).
+    # Baris yang jamnya tidak cocok dengan jadwal shift tidak dinilai (bukan on time, bukan terlambat): ditandai
+    # 'Is Schedule Mismatch' dan ditampilkan sebagai status tersendiri
+    df['Is Schedule Mismatch'] = mismatch
+    df['Is Check In On Time'] = check_in_rel <= deadline
+    df['Is Check Out On Time'] = check_out_rel >= minimum_rel
+
+    # Tentukan apakah hadir (ada Check In atau Attendance Code = 'H')
+    df['Is Present'] = (
+        (df['Check In'].notna() & (df['Check In'] != '')) |
+        (df['Attendance Code'] == 'H')
+    )
+    
+    # Tentukan kategori status
+    # Hari libur: Shift = 'dayoff' + hari libur yang dikonfigurasi (mis. list hari libur per bulan)
+    df['Is Dayoff'] = df['Shift'].str.contains('dayoff', case=False, na=False) | date_policy['Is Holiday']
+    
+    # Sakit: Attendance Code = 'S' atau Time Off Code = 'S'
+    df['Is Sick'] = (
+        (df['Attendance Code'] == 'S') |
+        (df['Time Off Code'] == 'S')
+    )
+    
+    # Cuti / izin (tidak termasuk sakit):
+    # - Attendance Code = 'CT' (Cuti)
+    # - Time Off Code = 'CT'
+    # - Attendance Code = 'CPD' (Cuti Perjalanan Dinas)
+    # - Time Off Code = 'CPD'
+    # - Shift mengandung 'Roster Leave'
+    df['Is Leave'] = (
+        (df['Attendance Code'] == 'CT') |
+        (df['Time Off Code'] == 'CT') |
+        (df['Attendance Code'] == 'CPD') |
+        (df['Time Off Code'] == 'CPD') |
+        (df['Shift'].str.contains('Roster Leave', case=False, na=False))
+    )
+    
+    # Tidak hadir (absen): bukan hadir, bukan cuti, bukan sakit, bukan hari libur
+    df['Is Absent'] = (
+        (~df['Is Present']) &
+        (~df['Is Leave']) &
+        (~df['Is Sick']) &
+        (~df['Is Dayoff'])
+    )
+    
+    # Layout kompak: categorical untuk string berulang, menit int16, flag bool (lihat utils/frame_layout.py)
+    return compact_frame(df.reset_index(drop=True))
+
+
+def late_in_by_rule(check_in_minutes, schedule_in_minutes, deadline_minutes):
+    """Menit terlambat (array float): Check In melewati batas masuk (deadline_minutes, sudah termasuk grace) ->
+    dihitung dari jam masuk jadwal, atau dari batas masuk jika lebih awal (puasa 07:30 vs jadwal 08:00) / tanpa jadwal.
+    Selain itu 0; tanpa Check In -> 0.
+    """
+    start = np.fmin(schedule_in_minutes, deadline_minutes)
+    late = np.where(check_in_minutes > deadline_minutes, check_in_minutes - start, 0.0)
+    return np.where(np.isnan(late), 0.0, late)
+
+
+def early_out_by_rule(check_out_minutes, minimum_minutes, export_flag, export_hours):
+    """Flag & durasi (jam) early out dari menit Check Out vs batas pulang, dalam bentuk array NumPy.
+
+    check_out_minutes berisi NaN untuk Check Out kosong; baris tersebut memakai flag/durasi dari export.
+    """
+    has_co = ~np.isnan(check_out_minutes)
+    shortfall = np.where(has_co, minimum_minutes - check_out_minutes, 0.0)
+    is_early = has_co & (shortfall > 0)
+    flag = np.where(has_co, is_early, export_flag)
+    hours = np.where(is_early, shortfall / 60.0, np.where(has_co, 0.0, export_hours))
+    return flag, hours
+
+
+def get_filter_index(month, df):
+    """FilterIndex untuk frame bulan (dibangun sekali per bulan & versi data frame, dipakai ulang di setiap rerun)."""
+    return _build_filter_index(resolve_month(month), frame_version(df), df)
+
+
+# FilterIndex hanya menyimpan posisi baris (tidak memegang frame bulan); dibatasi agar versi lama tidak menumpuk
+@st.cache_resource(show_spinner=False, max_entries=32)
+def _build_filter_index(month, version, _df):
+    return FilterIndex(_df, EXCLUDED_EMPLOYEE_NAMES, EXCLUDED_JOB_POSITIONS)
+
+
+def forget_month_data(month, version):
+    """Buang frame & FilterIndex bulan untuk versi data lama dari cache (dipanggil saat file sumber berubah)."""
+    frame_cache().discard(('frame', month, version))
+    _build_filter_index.clear(month, version, None)
+
+
+def filter_data(df, branch, org, index=None):
+    """Filter data berdasarkan branch dan organization. Mengecualikan nama di EXCLUDED_EMPLOYEE_NAMES dan posisi di EXCLUDED_JOB_POSITIONS (mis. Direktur).
+
+    Jika index (FilterIndex frame yang sama, lihat get_filter_index) diberikan, filter cukup integer take tanpa scan string.
+    """
+    if index is not None and index.n_rows == len(df):
+        return index.take(df, branch, org)
+    filtered_df = df[df['Branch'] == branch]
     if org != 'All':
         filtered_df = filtered_df[filtered_df['Organization'] == org]
     # Exclude karyawan tertentu berdasarkan nama (mis. Direktur)
@@ -232,34 +505,3 @@ def filter_data(df, branch, org):
         filtered_df = filtered_df[~mask_excluded_pos]
     return filtered_df
 
-
-def time_to_minutes(time_str):
-    """Convert waktu HH:MM ke total menit"""
-    if pd.isna(time_str) or time_str == '' or str(time_str).strip() == '':
-        return None
-    try:
-        time_clean = str(time_str).strip()
-        parts = time_clean.split(':')
-        if len(parts) == 2:
-            hour = int(parts[0])
-            minute = int(parts[1])
-            return hour * 60 + minute
-        return None
-    except:
-        return None
-
-
-def parse_check_in_to_minutes(check_in_str):
-    """Convert waktu format HH:MM ke menit dari 00:00"""
-    if pd.isna(check_in_str) or check_in_str == '' or check_in_str == '00:00':
-        return None
-    try:
-        parts = str(check_in_str).split(':')
-        if len(parts) == 2:
-            hours = int(parts[0])
-            minutes = int(parts[1])
-            return hours * 60 + minutes
-        return None
-    except:
-        return None
-
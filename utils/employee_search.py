@@ -0,0 +1,133 @@
+"""Index pencarian karyawan (nama & Employee ID): dibangun sekali per filter, kotak 'Cari Karyawan' tidak men-scan frame"""
+import bisect
+import unicodedata
+
+
+# Panjang n-gram maksimum; query lebih panjang dicari lewat irisan trigram lalu dicek substring
+_GRAM = 3
+
+# Pemisah kata/ID di teks gabungan per karyawan (tidak pernah muncul di query ternormalisasi)
+_SEP = '\x00'
+
+
+def normalize_text(value):
+    """Lowercase, tanpa aksen/diakritik, spasi dirapikan ('  Dévi  PUTRI ' -> 'devi putri')."""
+    text = unicodedata.normalize('NFKD', str(value))
+    text = ''.join(ch for ch in text if not unicodedata.combining(ch))
+    return ' '.join(text.lower().split())
+
+
+def _grams(token):
+    """Semua substring token dengan panjang 1.._GRAM."""
+    return {token[i:i + n] for n in range(1, _GRAM + 1) for i in range(len(token) - n + 1)}
+
+
+class _SortedKeys:
+    """Pasangan (key, posisi) terurut untuk lookup persis / prefix dengan bisect."""
+
+    def __init__(self, pairs):
+        pairs = sorted(pairs)
+        self.keys = [key for key, _ in pairs]
+        self.positions = [pos for _, pos in pairs]
+
+    def exact(self, key):
+        return set(self.positions[bisect.bisect_left(self.keys, key):bisect.bisect_right(self.keys, key)])
+
+    def prefixed(self, prefix):
+        # Semua key berawalan prefix terletak di antara prefix dan prefix + karakter tertinggi
+        start = bisect.bisect_left(self.keys, prefix)
+        end = bisect.bisect_left(self.keys, prefix + '\U0010ffff', start)
+        return set(self.positions[start:end])
+
+
+class EmployeeSearchIndex:
+    """Index nama & Employee ID karyawan unik untuk pencarian per ketikan.
+
+    Tiap kata query harus muncul (substring, tanpa beda huruf besar/kecil & aksen) di salah satu kata nama atau di
+    Employee ID. Kandidat diambil dari posting n-gram (1-3 huruf), jadi biaya per query sebanding jumlah kandidat,
+    bukan jumlah karyawan. Hasil diurutkan: ID/nama persis, prefix ID, prefix nama, awal kata nama, lalu substring;
+    di dalam tiap tingkat urut nama. Index read-only setelah dibangun (aman dipakai bersama banyak sesi).
+    """
+
+    def __init__(self, names, employee_ids=None):
+        ids_by_name = {}
+        if employee_ids is None:
+            employee_ids = [None] * len(names)
+        for name, employee_id in zip(names, employee_ids):
+            if name is None or name != name:
+                continue
+            ids = ids_by_name.setdefault(str(name), [])
+            if employee_id is not None and employee_id == employee_id and str(employee_id) not in ids:
+                ids.append(str(employee_id))
+        # Posisi = urutan nama (sama dengan sorted(...unique()) yang dipakai selector sebelumnya)
+        self.names = sorted(ids_by_name)
+        name_texts = [normalize_text(name) for name in self.names]
+        ids = [[normalize_text(employee_id) for employee_id in ids_by_name[name]] for name in self.names]
+        # Kata nama + ID per karyawan dalam satu string: cek substring kandidat cukup satu operasi 'in'
+        self._haystacks = [_SEP.join(text.split() + emp_ids) for text, emp_ids in zip(name_texts, ids)]
+        self._texts = _SortedKeys((text, pos) for pos, text in enumerate(name_texts))
+        self._tokens = _SortedKeys((token, pos) for pos, text in enumerate(name_texts) for token in text.split())
+        self._ids = _SortedKeys((employee_id, pos) for pos, emp_ids in enumerate(ids) for employee_id in emp_ids)
+        # n-gram -> set posisi
+        self._postings = {}
+        for pos, haystack in enumerate(self._haystacks):
+            for token in haystack.split(_SEP):
+                for gram in _grams(token):
+                    self._postings.setdefault(gram, set()).add(pos)
+
+    @classmethod
+    def from_frame(cls, df):
+        """Index dari frame yang memuat kolom Full Name & Employee ID (employee_stats atau frame harian)."""
+        pairs = df[['Full Name', 'Employee ID']].drop_duplicates()
+        return cls(pairs['Full Name'].tolist(), pairs['Employee ID'].tolist())
+
+    def __len__(self):
+        return len(self.names)
+
+    def _matching(self, term):
+        """Posisi yang kata namanya / ID-nya memuat term."""
+        if len(term) <= _GRAM:
+            return self._postings.get(term, set())
+        grams = sorted(
+            (self._postings.get(term[i:i + _GRAM], set()) for i in range(len(term) - _GRAM + 1)), key=len
+        )
+        candidates = set.intersection(*grams) if grams[0] else set()
+        haystacks = self._haystacks
+        return {pos for pos in candidates if term in haystacks[pos]}
+
+    def ids_with_prefix(self, prefix):
+        """Nama karyawan yang Employee ID-nya diawali prefix (urut nama)."""
+        return [self.names[pos] for pos in sorted(self._ids.prefixed(normalize_text(prefix)))]
+
+    def search(self, query, limit=None):
+        """Nama karyawan yang cocok dengan query, terurut relevansi. Query kosong -> semua nama (urut nama)."""
+        query = normalize_text(query)
+        if not query:
+            return self.names[:limit] if limit else list(self.names)
+        terms = query.split()
+        candidates = None
+        for term in sorted(terms, key=len, reverse=True):
+            matched = self._matching(term)
+            candidates = matched if candidates is None else candidates & matched
+            if not candidates:
+                return []
+
+        # Peringkat per tingkat (operasi set pada hasil bisect), bukan skor per kandidat
+        tiers = [
+            self._texts.exact(query) | self._ids.exact(query),
+            self._ids.prefixed(query),
+            self._texts.prefixed(query),
+            set.intersection(*(self._tokens.prefixed(term) for term in terms)),
+        ]
+        ranked = []
+        remaining = candidates
+        for tier in tiers:
+            hit = remaining & tier
+            if hit:
+                ranked.extend(sorted(hit))
+                remaining = remaining - hit
+        ranked.extend(sorted(remaining))
+        if limit:
+            ranked = ranked[:limit]
+        names = self.names
+        return [names[pos] for pos in ranked]
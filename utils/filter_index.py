@@ -0,0 +1,76 @@
+"""Index filter Branch/Organization per bulan: posisi baris dihitung sekali saat load, filter = integer take"""
+import weakref
+
+import numpy as np
+import pandas as pd
+
+
+# Posisi baris per Full Name untuk tiap objek frame: id(frame) -> {nama: posisi}. Entri dibuang saat frame dihapus GC
+_name_positions = {}
+
+
+def _category_mask(series, excluded, normalize):
+    """Mask bool per baris: nilai (setelah normalize) ada di excluded. String hanya diolah per kategori unik."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        categories = pd.Series(series.cat.categories.astype(str))
+        hit = normalize(categories).isin(excluded).to_numpy()
+        codes = series.cat.codes.to_numpy()
+        # Kode -1 (kosong) tidak pernah dikecualikan
+        return np.where(codes >= 0, np.append(hit, False)[codes], False)
+    return normalize(series.astype(str)).isin(excluded).to_numpy()
+
+
+class FilterIndex:
+    """Posisi baris per (Branch, Organization) untuk satu frame bulan, sudah tanpa baris yang dikecualikan.
+
+    Dibangun sekali per frame (lihat data_loader.get_filter_index); take() tidak melakukan operasi string apa pun.
+    """
+
+    def __init__(self, df, excluded_names=(), excluded_positions=()):
+        self.n_rows = len(df)
+        excluded = np.zeros(len(df), dtype=bool)
+        if excluded_names and 'Full Name' in df.columns:
+            excluded |= _category_mask(df['Full Name'], set(excluded_names), lambda s: s.str.strip())
+        if excluded_positions and 'Job Position' in df.columns:
+            excluded |= _category_mask(
+                df['Job Position'], {p.lower() for p in excluded_positions}, lambda s: s.str.strip().str.lower()
+            )
+        self.excluded = excluded
+
+        keep = np.flatnonzero(~excluded)
+        kept = df[['Branch', 'Organization']].take(keep)
+        # (branch, org) -> posisi baris di df asli (urut naik, sama seperti urutan boolean mask)
+        self.positions = {
+            key: keep[rows] for key, rows in kept.groupby(['Branch', 'Organization'], observed=True, sort=False).indices.items()
+        }
+        self.branch_positions = {
+            branch: keep[rows] for branch, rows in kept.groupby('Branch', observed=True, sort=False).indices.items()
+        }
+        # Opsi selector (semua baris, termasuk yang dikecualikan — sama seperti sebelumnya)
+        self.branches = sorted(df['Branch'].dropna().unique().tolist())
+        self.organizations = sorted(df['Organization'].dropna().unique().tolist())
+
+    def rows(self, branch, org):
+        """Posisi baris untuk filter branch/org ('All' = semua organization di branch)."""
+        if org == 'All':
+            return self.branch_positions.get(branch, np.empty(0, dtype=np.intp))
+        return self.positions.get((branch, org), np.empty(0, dtype=np.intp))
+
+    def take(self, df, branch, org):
+        """Frame hasil filter (frame baru, index asli dipertahankan seperti boolean mask)."""
+        return df.take(self.rows(branch, org))
+
+
+def rows_for_name(df, full_name):
+    """Baris satu karyawan (Full Name) dari df; sama dengan df[df['Full Name'] == full_name] tanpa scan seluruh kolom.
+
+    Posisi per nama dibangun sekali per objek frame (filtered_df AnalysisContext dipakai bersama semua sesi), lalu
+    pilih karyawan cukup integer take baris karyawan itu saja.
+    """
+    key = id(df)
+    positions = _name_positions.get(key)
+    if positions is None:
+        positions = df.groupby('Full Name', observed=True, sort=False).indices
+        _name_positions[key] = positions
+        weakref.finalize(df, _name_positions.pop, key, None)
+    return df.take(positions.get(full_name, np.empty(0, dtype=np.intp)))
@@ -11,6 +11,14 @@ def format_hours(hours):
         return f"{h:,} jam"
 
 
+def format_clock_minutes(minutes):
+    """Format menit sejak 00:00 ke 'HH:MM' ('-' jika kosong)"""
+    if minutes is None or minutes != minutes:
+        return "-"
+    minutes = int(round(minutes))
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
 def format_hours_simple(hours):
     """Format jam desimal ke format sederhana (untuk help text)"""
     return f"{hours:,.2f} jam"
@@ -0,0 +1,143 @@
+"""Cache frame bertingkat (memori LRU dengan anggaran byte + disk): pengganti st.cache_data untuk bulan & agregat besar"""
+import atexit
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+from utils.cache_store import write_spill, read_spill, remove_spill
+
+
+# Anggaran memori semua frame di cache (MB). Bulan yang keluar dari memori dibaca ulang dari cache Parquet
+MEMORY_BUDGET_BYTES = int(float(os.environ.get('ABSENCE_MEMORY_BUDGET_MB', '512')) * 1024 * 1024)
+
+# Frame bersama dibagikan ke semua sesi tanpa salinan. Dengan Copy-on-Write (selalu aktif sejak pandas 3) hasil
+# filter/take/pilih kolom adalah salinan malas: menambah/mengubah kolom di hasil itu tidak pernah menulis balik ke
+# frame bersama, jadi .copy() defensif tidak diperlukan. pandas 2 perlu diaktifkan eksplisit.
+if int(pd.__version__.split('.')[0]) < 3:
+    pd.set_option('mode.copy_on_write', True)
+
+
+def frame_nbytes(df):
+    """Perkiraan memori frame (termasuk isi kategori/string)."""
+    return int(df.memory_usage(deep=True, index=True).sum())
+
+
+def _spill_name(key):
+    return '-'.join(str(part) for part in key[:2]) + '-' + hashlib.sha1(repr(key).encode('utf-8')).hexdigest()[:12]
+
+
+class FrameCache:
+    """LRU frame per key dengan anggaran byte total.
+
+    Hit mengembalikan objek frame yang sama (tanpa pickle/copy): pemanggil wajib memperlakukannya read-only.
+    Entri yang keluar karena anggaran penuh:
+    - spill=False (mis. frame bulan): cukup dibuang, build() membaca ulang dari cache Parquet yang sudah ada
+    - spill=True (agregat): ditulis ke SPILL_DIR dan dibaca dari sana saat diminta lagi sebelum build() dijalankan
+    Frame yang sendirian melebihi anggaran tidak disimpan di memori.
+    """
+
+    def __init__(self, budget_bytes=MEMORY_BUDGET_BYTES):
+        self.budget_bytes = budget_bytes
+        self._lock = threading.Lock()
+        # key -> (frame, nbytes, spill)
+        self._entries = OrderedDict()
+        self._bytes = 0
+        # key spill yang filenya ada di disk
+        self._spilled = set()
+        self.hits = 0
+        self.spill_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        remove_spill()
+        atexit.register(remove_spill)
+
+    def get(self, key, build, spill=False, sizeof=frame_nbytes):
+        """Frame untuk key: dari memori, dari spill disk, atau build() (hasil None tidak di-cache).
+
+        Objek selain frame (mis. AnalysisContext) boleh disimpan dengan sizeof yang menghitung byte-nya; spill hanya
+        untuk frame.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            spilled = key in self._spilled
+        frame = read_spill(_spill_name(key)) if spilled else None
+        with self._lock:
+            if frame is not None:
+                self.spill_hits += 1
+            else:
+                self.misses += 1
+        if frame is None:
+            frame = build()
+            if frame is None:
+                return None
+        self.put(key, frame, spill, sizeof)
+        return frame
+
+    def put(self, key, frame, spill=False, sizeof=frame_nbytes):
+        """Simpan frame sebagai entri terbaru lalu keluarkan entri terlama sampai total kembali di bawah anggaran."""
+        nbytes = sizeof(frame)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            if nbytes > self.budget_bytes:
+                return
+            self._entries[key] = (frame, nbytes, spill)
+            self._bytes += nbytes
+            evicted = []
+            while self._bytes > self.budget_bytes:
+                old_key, (old_frame, old_bytes, old_spill) = self._entries.popitem(last=False)
+                self._bytes -= old_bytes
+                self.evictions += 1
+                if old_spill and old_key not in self._spilled:
+                    evicted.append((old_key, old_frame))
+        # Tulis spill di luar lock (I/O disk)
+        for old_key, old_frame in evicted:
+            if write_spill(_spill_name(old_key), old_frame):
+                with self._lock:
+                    self._spilled.add(old_key)
+
+    def discard(self, key):
+        """Buang key dari memori dan disk (versi data lama)."""
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._bytes -= entry[1]
+            spilled = key in self._spilled
+            self._spilled.discard(key)
+        if spilled:
+            remove_spill(_spill_name(key))
+
+    def stats(self):
+        """Counter & isi cache: entries, bytes, budget_bytes, spilled, hits, spill_hits, misses, evictions."""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'budget_bytes': self.budget_bytes,
+                'spilled': len(self._spilled),
+                'hits': self.hits,
+                'spill_hits': self.spill_hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }
+
+
+_frame_cache = None
+_frame_cache_lock = threading.Lock()
+
+
+def frame_cache():
+    """FrameCache bersama satu proses (frame bulan, cube bulan dan konteks analisis)."""
+    global _frame_cache
+    with _frame_cache_lock:
+        if _frame_cache is None:
+            _frame_cache = FrameCache()
+        return _frame_cache
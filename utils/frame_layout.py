@@ -0,0 +1,114 @@
+"""Layout kompak frame absensi (categorical, menit int16, flag bool) dan laporan memori per bulan"""
+import numpy as np
+import pandas as pd
+
+
+# String berulang -> categorical (di Parquet tersimpan sebagai dictionary-encoded Arrow string)
+CATEGORY_COLUMNS = [
+    'Full Name', 'Branch', 'Organization', 'Job Position', 'Shift',
+    'Attendance Code', 'Time Off Code',
+    'Schedule In', 'Schedule Out', 'Check In', 'Check Out', 'Late In', 'Early Out', 'Real Working Hour', 'Actual Working Hour',
+]
+
+# Kolom menit (0–1440) -> int16; yang boleh kosong memakai Int16 nullable
+MINUTE_COLUMNS = ['Check In Deadline Minutes', 'Check Out Minimum Minutes']
+NULLABLE_MINUTE_COLUMNS = ['Check In Minutes', 'Check Out Minutes', 'Schedule In Minutes']
+
+
+def compact_frame(df):
+    """Ubah frame hasil proses ke layout kompak. Nilai tidak berubah, hanya dtype."""
+    df = df.copy()
+    for col in CATEGORY_COLUMNS:
+        if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype('category')
+    for col in MINUTE_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype(np.int16)
+    for col in NULLABLE_MINUTE_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype('Int16')
+    # Flag 'Is *' selalu bool NumPy non-nullable (1 byte/baris); pandas tidak mendukung kolom bit-packed
+    for col in df.columns:
+        if col.startswith('Is '):
+            df[col] = df[col].astype(bool)
+    if 'Employee ID' in df.columns:
+        df['Employee ID'] = df['Employee ID'].astype(np.int32)
+    return df
+
+
+def union_categories(frames):
+    """Samakan kategori tiap kolom categorical di semua frame (gabungan, terurut) agar pd.concat tetap categorical."""
+    frames = list(frames)
+    if not frames:
+        return frames
+    for col in frames[0].columns:
+        if all(isinstance(f[col].dtype, pd.CategoricalDtype) for f in frames if col in f.columns):
+            categories = pd.api.types.union_categoricals(
+                [f[col] for f in frames if col in f.columns], sort_categories=True
+            ).categories
+            frames = [
+                f.assign(**{col: f[col].cat.set_categories(categories)}) if col in f.columns else f
+                for f in frames
+            ]
+    return frames
+
+
+def concat_frames(frames, keys, key_column='Period'):
+    """Gabungkan beberapa frame kompak menjadi satu, dengan kolom partisi key_column (categorical berurutan).
+
+    Kategori tiap kolom categorical disatukan dulu agar hasil gabungan tetap categorical (pd.concat biasa
+    akan jatuh ke object jika kategori antar frame berbeda).
+    """
+    frames = union_categories(frames)
+    if not frames:
+        return pd.DataFrame()
+    period = pd.CategoricalDtype(list(keys), ordered=True)
+    frames = [f.assign(**{key_column: pd.Categorical([key] * len(f), dtype=period)}) for f, key in zip(frames, keys)]
+    return pd.concat(frames, ignore_index=True)
+
+
+def expanded_frame(df):
+    """Kebalikan compact_frame: layout lama (string object, int64) — dipakai sebagai pembanding di memory_report."""
+    df = df.copy()
+    for col in df.columns:
+        dtype = df[col].dtype
+        if isinstance(dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype(object)
+        elif pd.api.types.is_integer_dtype(dtype):
+            df[col] = df[col].astype('float64' if df[col].isna().any() else 'int64')
+    return df
+
+
+def frame_memory_bytes(df):
+    """Total memori frame termasuk isi string (deep)."""
+    return int(df.memory_usage(deep=True).sum())
+
+
+def memory_report(months=None):
+    """DataFrame ukuran memori per bulan: layout lama (object) vs layout kompak."""
+    from utils.data_loader import catalog_months, load_month
+
+    rows = []
+    for month in (months or catalog_months()):
+        df = load_month(month)
+        before = frame_memory_bytes(expanded_frame(df))
+        after = frame_memory_bytes(df)
+        rows.append({
+            'Bulan': month,
+            'Baris': len(df),
+            'Sebelum (bytes)': before,
+            'Sesudah (bytes)': after,
+            'Bytes/Baris Sebelum': round(before / len(df), 1) if len(df) else 0,
+            'Bytes/Baris Sesudah': round(after / len(df), 1) if len(df) else 0,
+            'Hemat (%)': round((1 - after / before) * 100, 1) if before else 0,
+        })
+    return pd.DataFrame(rows)
+
+
+if __name__ == '__main__':
+    # python -m utils.frame_layout  (jalankan dari root project)
+    report = memory_report()
+    with pd.option_context('display.width', 200, 'display.max_columns', 20):
+        print(report.to_string(index=False))
+        print(f"\nTotal sebelum: {report['Sebelum (bytes)'].sum():,} bytes | "
+              f"Total sesudah: {report['Sesudah (bytes)'].sum():,} bytes")
@@ -0,0 +1,123 @@
+"""Ingest inkremental export bulan berjalan: hash per baris (Employee ID, Date), hanya baris baru/berubah yang diproses ulang"""
+import numpy as np
+import pandas as pd
+
+from utils.frame_layout import union_categories
+
+
+def row_hashes(raw):
+    """Hash uint64 per baris export mentah (semua kolom; kategori di-hash menurut nilai, bukan kode)."""
+    return pd.util.hash_pandas_object(raw, index=False).to_numpy()
+
+
+def _row_keys(employee_ids, dates):
+    """(id, hari) per baris sebagai array int64 dari kolom Date datetime; NaT = nilai int64 minimum (tetap bisa dicocokkan)."""
+    ids = np.asarray(employee_ids, dtype=np.int64)
+    days = pd.Series(dates, copy=False).to_numpy(dtype='datetime64[D]').astype(np.int64)
+    return ids, days
+
+
+def _packed(ids, days):
+    """id << 22 | hari sebagai satu int64 jika muat (id < 2^40, hari 1970–13000), selain itu None."""
+    if len(ids) and (ids.min() < 0 or ids.max() >= (1 << 40) or days.min() < 0 or days.max() >= (1 << 22)):
+        return None
+    return pd.Index((ids << 22) | days)
+
+
+def _key_indexes(old_keys, new_keys):
+    """Index pencarian (lama, baru) per baris.
+
+    Kasus umum (tanpa duplikat (id, hari), tanggal valid): satu kunci int64 -> lookup hash Index int64.
+    Selain itu MultiIndex (id, hari, nomor urut duplikat).
+    """
+    old_index, new_index = _packed(*old_keys), _packed(*new_keys)
+    if old_index is not None and new_index is not None and old_index.is_unique and new_index.is_unique:
+        return old_index, new_index
+    return tuple(
+        pd.MultiIndex.from_arrays([ids, days, pd.Series(np.zeros(len(ids))).groupby([ids, days]).cumcount().to_numpy()])
+        for ids, days in (old_keys, new_keys)
+    )
+
+
+def _successors(ids, days):
+    """Posisi baris tanggal berikutnya dari karyawan yang sama (-1 jika baris terakhir karyawan)."""
+    order = np.lexsort((days, ids))
+    successor = np.full(len(ids), -1, dtype=np.intp)
+    same_employee = ids[order][1:] == ids[order][:-1]
+    successor[order[:-1][same_employee]] = order[1:][same_employee]
+    return successor
+
+
+class PatchPlan:
+    """Pencocokan baris export baru dengan frame hasil proses lama (urutan baris export baru).
+
+    reuse[i]    = posisi baris lama yang identik (hash sama) untuk baris baru i, -1 jika baru/berubah
+    recompute   = baris yang harus diproses ulang: baru/berubah, atau baris tanggal berikutnya (pairing shift malam)
+                  berubah/bergeser
+    context     = recompute + baris tanggal berikutnya masing-masing (input pipeline, tidak semua dipakai hasilnya)
+    employees   = Employee ID yang barisnya diproses ulang atau dihapus (untuk patch agregat turunan)
+    """
+
+    def __init__(self, old_ids, old_dates, old_hashes, new_ids, new_dates, new_hashes):
+        old_keys = _row_keys(old_ids, old_dates)
+        new_keys = _row_keys(new_ids, new_dates)
+        old_index, new_index = _key_indexes(old_keys, new_keys)
+        positions = old_index.get_indexer(new_index)
+        matched = positions >= 0
+        matched[matched] = old_hashes[positions[matched]] == new_hashes[matched]
+        reuse = np.where(matched, positions, -1)
+
+        # Baris tetap yang baris berikutnya (karyawan sama) berubah atau bukan lagi baris yang sama seperti sebelumnya
+        new_successor = _successors(new_keys[0], new_keys[1])
+        old_successor = _successors(old_keys[0], old_keys[1])
+        has_next = new_successor >= 0
+        next_reuse = np.where(has_next, reuse[new_successor], -1)
+        stale = matched & (
+            (has_next & (next_reuse < 0)) | (old_successor[np.where(matched, reuse, 0)] != next_reuse)
+        )
+        recompute = ~matched | stale
+
+        context = recompute.copy()
+        followers = new_successor[recompute]
+        context[followers[followers >= 0]] = True
+
+        removed = np.ones(len(old_hashes), dtype=bool)
+        removed[reuse[matched]] = False
+        removed_ids = np.asarray(old_ids)[removed]
+
+        self.reuse = reuse
+        self.recompute = recompute
+        self.context = context
+        self.employees = np.union1d(np.asarray(new_ids)[recompute], removed_ids)
+        self.n_removed = int(removed.sum())
+
+    @property
+    def n_recompute(self):
+        return int(self.recompute.sum())
+
+    def apply(self, cached, raw, process):
+        """Frame hasil proses untuk export baru: baris tetap diambil dari cached, sisanya dari process(baris konteks).
+
+        Hasil identik dengan process(raw) (urutan baris, nilai dan kategori) selama pipeline bersifat per baris
+        kecuali pairing tanggal berikutnya.
+        """
+        recompute_positions = np.flatnonzero(self.recompute)
+        keep_positions = np.flatnonzero(~self.recompute)
+        if len(recompute_positions):
+            context_positions = np.flatnonzero(self.context)
+            fresh = process(raw.take(context_positions))
+            parts = union_categories([
+                cached.take(self.reuse[keep_positions]),
+                fresh.take(np.searchsorted(context_positions, recompute_positions)),
+            ])
+            combined = pd.concat(parts, ignore_index=True)
+            order = np.argsort(np.concatenate([keep_positions, recompute_positions]), kind='stable')
+            result = combined.take(order).reset_index(drop=True)
+        else:
+            # Hanya baris dihapus / tanpa perubahan: cukup ambil baris lama sesuai urutan export baru
+            result = cached.take(self.reuse).reset_index(drop=True)
+        # Kategori yang hanya dipakai baris lama yang sudah hilang dibuang (sama seperti proses penuh)
+        for col in result.columns:
+            if isinstance(result[col].dtype, pd.CategoricalDtype):
+                result[col] = result[col].cat.remove_unused_categories()
+        return result
@@ -0,0 +1,138 @@
+"""Kalender kebijakan absensi (libur, cuti bersama, puasa) dari config/policy_calendar.json dengan index interval untuk lookup vektor"""
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+
+POLICY_CALENDAR_PATH = os.environ.get('ABSENCE_POLICY_CALENDAR', os.path.join('config', 'policy_calendar.json'))
+
+# Tipe periode yang menandai hari libur (tidak dihitung Work Day, baris absensi = Dayoff)
+HOLIDAY_TYPES = {'holiday', 'collective_leave'}
+
+# Field aturan di config -> kolom tabel kebijakan (menit)
+RULE_FIELDS = {
+    'check_in_deadline': 'Check In Deadline Minutes',
+    'check_out_minimum': 'Check Out Minimum Minutes',
+    'hour_adjustment_minutes': 'Hour Adjustment Minutes',
+}
+
+# Aturan normal jika config tidak menyebut default
+BUILTIN_DEFAULT = {
+    'check_in_deadline': '08:15',
+    'check_out_minimum': '17:00',
+    'hour_adjustment_minutes': 0,
+}
+
+DATE_POLICY_COLUMNS = list(RULE_FIELDS.values()) + ['Is Holiday']
+
+
+def _minutes(value):
+    """'HH:MM' -> menit; angka dipakai apa adanya."""
+    if isinstance(value, str):
+        hours, minutes = value.strip().split(':')
+        return int(hours) * 60 + int(minutes)
+    return int(value)
+
+
+def _day(value):
+    return np.datetime64(value, 'D').astype(np.int64)
+
+
+class PolicyCalendar:
+    """Index interval atas periode kebijakan.
+
+    Semua tanggal awal/akhir periode dipecah menjadi segmen tidak tumpang tindih [edges[i], edges[i+1]);
+    nilai kebijakan disimpan per segmen sehingga resolve() cukup satu np.searchsorted (O(log n) per tanggal, vektor).
+    """
+
+    def __init__(self, config):
+        default = {**BUILTIN_DEFAULT, **config.get('default', {})}
+        self.default = {column: _minutes(default[field]) for field, column in RULE_FIELDS.items()}
+        self.default['Is Holiday'] = False
+
+        periods = []
+        for period in config.get('periods', []):
+            start = _day(period['start'])
+            end = _day(period.get('end', period['start']))
+            if end < start:
+                raise ValueError(f"Periode kebijakan '{period.get('name', period['start'])}': end sebelum start")
+            periods.append((start, end, period))
+        self.periods = periods
+
+        self.edges = np.unique(np.array(
+            [start for start, _, _ in periods] + [end + 1 for _, end, _ in periods], dtype=np.int64
+        ))
+        # Segmen i = [edges[i], edges[i+1]); segmen terakhir (>= edges[-1]) selalu aturan default
+        self.values = {
+            column: np.full(len(self.edges), value, dtype=bool if column == 'Is Holiday' else np.int64)
+            for column, value in self.default.items()
+        }
+        for start, end, period in periods:
+            first, stop = np.searchsorted(self.edges, [start, end + 1])
+            if period.get('type') in HOLIDAY_TYPES:
+                self.values['Is Holiday'][first:stop] = True
+            for field, column in RULE_FIELDS.items():
+                if field in period:
+                    self.values[column][first:stop] = _minutes(period[field])
+
+    def resolve(self, dates):
+        """DataFrame kebijakan per baris (DATE_POLICY_COLUMNS), index sama dengan dates. Tanggal kosong -> aturan default."""
+        dates = pd.Series(dates, copy=False)
+        days = pd.to_datetime(dates).to_numpy(dtype='datetime64[D]')
+        valid = ~np.isnat(days)
+        segments = np.searchsorted(self.edges, days.astype(np.int64), side='right') - 1
+        inside = valid & (segments >= 0)
+        safe = segments.clip(min=0)
+        return pd.DataFrame({
+            column: np.where(inside, self.values[column][safe], self.default[column]) if len(self.edges)
+            else np.full(len(dates), self.default[column])
+            for column in DATE_POLICY_COLUMNS
+        }, index=dates.index)
+
+    def holiday_dates(self):
+        """Semua tanggal libur (holiday/collective_leave) sebagai array datetime64[D] urut."""
+        days = [
+            np.arange(start, end + 1)
+            for start, end, period in self.periods if period.get('type') in HOLIDAY_TYPES
+        ]
+        if not days:
+            return np.array([], dtype='datetime64[D]')
+        return np.unique(np.concatenate(days)).astype('datetime64[D]')
+
+
+_loaded = {}
+
+
+def policy_calendar(path=None):
+    """PolicyCalendar dari file config (dibaca ulang otomatis jika file berubah). File tidak ada -> hanya aturan default."""
+    path = path or POLICY_CALENDAR_PATH
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+    except OSError:
+        mtime_ns = None
+    cached = _loaded.get(path)
+    if cached is None or cached[0] != mtime_ns:
+        if mtime_ns is None:
+            config, digest = {}, 'default'
+        else:
+            with open(path, 'rb') as f:
+                raw = f.read()
+            config, digest = json.loads(raw.decode('utf-8')), hashlib.sha1(raw).hexdigest()[:12]
+        cached = (mtime_ns, PolicyCalendar(config), digest)
+        _loaded[path] = cached
+    return cached[1]
+
+
+def policy_version(path=None):
+    """Hash singkat isi config kebijakan, untuk key cache hasil proses (berubah jika kalender diedit)."""
+    path = path or POLICY_CALENDAR_PATH
+    policy_calendar(path)
+    return _loaded[path][2]
+
+
+def resolve_date_policy(dates):
+    """Kebijakan per baris dari kalender aktif (lihat PolicyCalendar.resolve)."""
+    return policy_calendar().resolve(dates)
@@ -0,0 +1,100 @@
+"""Worker precompute di proses terpisah: bulan hasil proses & cube karyawan ditulis sebagai file Arrow IPC untuk di-mmap UI
+
+Jalankan bersamaan dengan server (dari root project):
+
+    python -m utils.precompute_worker &
+    streamlit run app.py
+
+UI memakai artefak hanya jika versinya sama dengan data_version bulan itu; jika worker tidak jalan atau belum selesai,
+UI tetap menghitung sendiri seperti biasa.
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from utils.cache_store import write_precomputed, has_precomputed, prune_precomputed
+from utils.data_loader import (
+    BASELINE_MONTH, EXCLUDED_EMPLOYEE_NAMES, EXCLUDED_JOB_POSITIONS,
+    has_month, load_month, data_version, refresh_month_catalog,
+)
+from utils.filter_index import FilterIndex
+from utils.rollup import CUBE_VERSION, build_employee_cube
+
+
+def _frame(df):
+    return df
+
+
+def _cube(df):
+    return build_employee_cube(df, FilterIndex(df, EXCLUDED_EMPLOYEE_NAMES, EXCLUDED_JOB_POSITIONS).excluded)
+
+
+# Artefak per bulan: nama file -> fungsi(frame bulan) -> frame yang ditulis. Cube memuat profil karyawan
+# (hitungan compliance & statistik jam masuk), jadi halaman detail karyawan ikut membaca artefak ini
+ARTIFACTS = {
+    'frame': _frame,
+    f'cube-v{CUBE_VERSION}': _cube,
+}
+
+
+def pending_months():
+    """Bulan katalog yang artefaknya belum ada untuk versi data saat ini (baseline dulu, lalu dari bulan terbaru)."""
+    months = [
+        month for month in reversed(list(refresh_month_catalog()))
+        if not has_precomputed(month, ARTIFACTS, data_version(month))
+    ]
+    return sorted(months, key=lambda month: month != BASELINE_MONTH)
+
+
+def materialize_month(month):
+    """Bangun & tulis semua artefak satu bulan (dijalankan di proses pool).
+
+    Mengembalikan (jumlah baris, detik), atau None jika bulan hilang / file berubah selama diproses (dicoba lagi di
+    putaran berikutnya).
+    """
+    start = time.perf_counter()
+    # Katalog proses anak bisa lebih lama dari katalog proses utama
+    refresh_month_catalog()
+    if not has_month(month):
+        return None
+    version = data_version(month)
+    df = load_month(month)
+    if data_version(month) != version:
+        return None
+    for artifact, build in ARTIFACTS.items():
+        write_precomputed(month, artifact, build(df), version)
+    prune_precomputed(month, version)
+    return len(df), time.perf_counter() - start
+
+
+def run(workers=None, interval=30.0, once=False):
+    """Loop worker: setiap interval detik bangun artefak bulan yang baru/berubah memakai pool proses (semua core)."""
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        while True:
+            futures = {pool.submit(materialize_month, month): month for month in pending_months()}
+            for future in as_completed(futures):
+                month = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    print(f"{month}: gagal ({e})", flush=True)
+                    continue
+                if result is None:
+                    print(f"{month}: dilewati (file berubah saat diproses)", flush=True)
+                else:
+                    print(f"{month}: {result[0]:,} baris, {result[1]:.2f} s", flush=True)
+            if once:
+                return
+            time.sleep(interval)
+
+
+if __name__ == '__main__':
+    # python -m utils.precompute_worker [--once] [--workers N] [--interval DETIK]  (jalankan dari root project)
+    parser = argparse.ArgumentParser(description="Precompute bulan & cube karyawan ke .cache/precomputed")
+    parser.add_argument('--workers', type=int, default=None, help="jumlah proses (default: semua core)")
+    parser.add_argument('--interval', type=float, default=30.0, help="jeda antar scan katalog (detik)")
+    parser.add_argument('--once', action='store_true', help="satu putaran lalu keluar")
+    args = parser.parse_args()
+    run(workers=args.workers, interval=args.interval, once=args.once)
@@ -0,0 +1,164 @@
+"""Prewarm cache di background: semua bulan katalog + konteks analisis (branch, 'All') dihitung worker thread sejak server start"""
+import logging
+import os
+import queue
+import threading
+
+import streamlit as st
+
+from utils.data_loader import (
+    BASELINE_MONTH, catalog_months, has_month, load_data, get_filter_index, data_version, refresh_month_catalog,
+)
+from utils.analysis_context import get_month_cube, load_analysis_context
+from utils.source_watcher import SourceWatcher
+
+
+# ABSENCE_PREWARM=0 mematikan prewarm (mis. saat debug satu bulan)
+PREWARM_ENABLED = os.environ.get('ABSENCE_PREWARM', '1') != '0'
+PREWARM_WORKERS = int(os.environ.get('ABSENCE_PREWARM_WORKERS', '2'))
+
+logger = logging.getLogger(__name__)
+
+
+class _PrewarmThreadFilter(logging.Filter):
+    """Buang peringatan 'missing ScriptRunContext' dari thread prewarm: fungsi cache memang dipanggil di luar sesi."""
+
+    def filter(self, record):
+        return not threading.current_thread().name.startswith('prewarm-')
+
+
+for _name in ('streamlit.runtime.scriptrunner_utils.script_run_context', 'streamlit.runtime.scriptrunner.script_run_context'):
+    logging.getLogger(_name).addFilter(_PrewarmThreadFilter())
+
+
+def warm_month(month):
+    """Isi semua cache satu bulan: frame, FilterIndex, cube bulan dan konteks analisis tiap branch (org 'All')."""
+    df = load_data(month)
+    if df is None:
+        raise RuntimeError(f"Data bulan {month} gagal dimuat")
+    index = get_filter_index(month, df)
+    get_month_cube(month)
+    for branch in index.branches:
+        load_analysis_context(month, branch, 'All')
+
+
+class Prewarmer:
+    """Antrian bulan yang dipanaskan oleh worker thread daemon (tidak menahan proses saat server berhenti).
+
+    Status per bulan disimpan bersama versi datanya: bulan dianggap siap hanya jika versi yang dipanaskan sama dengan
+    data_version saat ini. Halaman tidak pernah menunggu prewarmer; mereka cukup memanggil fungsi cache seperti biasa
+    (bulan yang sedang dipanaskan ditunggu lewat single-flight, bukan dihitung dua kali).
+    """
+
+    def __init__(self, workers=PREWARM_WORKERS):
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        # bulan -> (versi data, 'queued' | 'running' | 'ready' | 'failed')
+        self._status = {}
+        self._threads = [
+            threading.Thread(target=self._run, name=f'prewarm-{i}', daemon=True) for i in range(max(workers, 1))
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, month, force=False):
+        """Antrekan bulan jika versi datanya sekarang belum pernah diantrekan (atau force). True jika masuk antrian.
+
+        Bulan yang gagal tidak dicoba ulang sampai file atau config-nya berubah (versi data baru).
+        """
+        version = data_version(month)
+        with self._lock:
+            current = self._status.get(month)
+            if current is not None and current[0] == version and not (force and current[1] in ('ready', 'failed')):
+                return False
+            self._status[month] = (version, 'queued')
+        self._queue.put(month)
+        return True
+
+    def submit_all(self, months, force=False):
+        """Antrekan semua bulan: baseline dulu (dipakai halaman bulan lain), lalu dari bulan terbaru."""
+        months = list(months)
+        ordered = ([BASELINE_MONTH] if BASELINE_MONTH in months else []) + \
+            [month for month in reversed(months) if month != BASELINE_MONTH]
+        return sum(self.submit(month, force) for month in ordered)
+
+    def refresh(self, month):
+        """Bangun ulang cache bulan yang sumbernya berubah (dipanggil SourceWatcher setelah cache lama dibuang).
+
+        Bulan baseline berubah -> semua bulan dipanaskan ulang karena konteks analisisnya ikut dibuang.
+        """
+        months = catalog_months() if month == BASELINE_MONTH else [month]
+        self.submit_all(months, force=True)
+
+    def _set(self, month, version, state):
+        with self._lock:
+            # Jangan timpa status versi yang lebih baru (bulan diantrekan ulang saat sedang dipanaskan)
+            if self._status.get(month, (version,))[0] == version:
+                self._status[month] = (version, state)
+
+    def _run(self):
+        while True:
+            month = self._queue.get()
+            try:
+                with self._lock:
+                    version, state = self._status[month]
+                if state != 'queued':
+                    continue
+                self._set(month, version, 'running')
+                try:
+                    warm_month(month)
+                except Exception:
+                    logger.exception("Prewarm bulan %s gagal", month)
+                    self._set(month, version, 'failed')
+                else:
+                    self._set(month, version, 'ready')
+            finally:
+                self._queue.task_done()
+
+    def is_ready(self, month):
+        """True jika cache bulan sudah hangat untuk versi data saat ini."""
+        with self._lock:
+            current = self._status.get(month)
+        return current is not None and current[1] == 'ready' and current[0] == data_version(month)
+
+    def progress(self):
+        """(jumlah bulan siap, jumlah bulan katalog yang diantrekan) untuk indikator di UI."""
+        with self._lock:
+            status = dict(self._status)
+        status = {month: value for month, value in status.items() if has_month(month)}
+        ready = sum(state == 'ready' and version == data_version(month) for month, (version, state) in status.items())
+        return ready, len(status)
+
+    def status(self):
+        """Salinan status per bulan: bulan -> 'queued' | 'running' | 'ready' | 'failed'."""
+        with self._lock:
+            return {month: state for month, (_, state) in self._status.items()}
+
+    def wait(self):
+        """Blok sampai antrian kosong (untuk skrip / warm-up manual, bukan untuk halaman)."""
+        self._queue.join()
+
+
+@st.cache_resource(show_spinner=False)
+def get_prewarmer():
+    """Satu Prewarmer per proses server."""
+    return Prewarmer()
+
+
+@st.cache_resource(show_spinner=False)
+def get_source_watcher():
+    """Satu SourceWatcher per proses server; bulan yang berubah dibangun ulang lewat Prewarmer (jika aktif)."""
+    return SourceWatcher(on_change=get_prewarmer().refresh if PREWARM_ENABLED else None)
+
+
+def start_prewarm():
+    """Mulai/lanjutkan prewarm semua bulan katalog dan pemantau file sumber; murah dipanggil setiap rerun.
+
+    Mengembalikan Prewarmer, atau None jika prewarm dimatikan (watcher tetap jalan untuk membuang cache basi).
+    """
+    get_source_watcher()
+    if not PREWARM_ENABLED:
+        return None
+    prewarmer = get_prewarmer()
+    prewarmer.submit_all(refresh_month_catalog())
+    return prewarmer
@@ -0,0 +1,198 @@
+"""Cube agregat grain karyawan × bulan; statistik organization/branch/total diturunkan dari cube (tanpa scan baris harian)"""
+import numpy as np
+import pandas as pd
+
+from utils.business_calendar import employee_work_days
+from utils.frame_layout import union_categories
+
+
+# Grain cube (sama dengan kunci groupby calculate_employee_stats)
+CUBE_KEYS = ['Employee ID', 'Full Name', 'Branch', 'Organization', 'Job Position']
+
+# Ukuran (kolom cube) -> kolom sumber di frame harian; semuanya dijumlahkan
+CUBE_MEASURES = {
+    'Hari Record': None,  # jumlah baris harian
+    'Hari Dengan Jam Kerja': None,  # baris dengan Real Working Hour Decimal > 0
+    'Jumlah Hadir': 'Is Present',
+    'Jumlah Absen': 'Is Absent',
+    'Jumlah Hari Libur': 'Is Dayoff',
+    'Jumlah Cuti': 'Is Leave',
+    'Jumlah Sakit': 'Is Sick',
+    'Jumlah Late In': 'Is Late In',
+    'Jumlah Early Out': 'Is Early Out',
+    'Total Jam Kerja (Real)': 'Real Working Hour Decimal',
+    'Total Jam Late In': 'Late In Decimal',
+    'Total Jam Early Out': 'Early Out Decimal',
+    'Hari Kerja >= 8 Jam': None,  # baris dengan Real Working Hour Decimal >= 8
+    'Jumlah Masuk On Time': None,  # baris dengan Check In dan Is Check In On Time
+}
+
+# Statistik jam masuk per karyawan (menit sejak 00:00) atas hari hadir non-libur, Check In 00:00 = tidak ada data.
+# Tidak aditif: ikut di baris cube (grain karyawan) tapi tidak di-roll-up
+CUBE_CHECK_IN_STATS = {
+    'Check In Paling Awal': 'min',
+    'Check In Median': 'median',
+    'Check In Paling Akhir': 'max',
+}
+
+# Naikkan jika kolom cube berubah: artefak cube precompute versi lama tidak dibaca lagi
+CUBE_VERSION = 2
+
+
+def build_employee_cube(df, excluded=None):
+    """Cube karyawan × bulan dari frame harian satu bulan. excluded: mask bool baris yang tidak ikut (FilterIndex.excluded)."""
+    if excluded is not None:
+        df = df.take(np.flatnonzero(~excluded))
+    source = pd.DataFrame({key: df[key] for key in CUBE_KEYS})
+    for measure, column in CUBE_MEASURES.items():
+        if column is not None:
+            source[measure] = df[column]
+    source['Hari Record'] = 1
+    source['Hari Dengan Jam Kerja'] = df['Real Working Hour Decimal'] > 0
+    source['Hari Kerja >= 8 Jam'] = df['Real Working Hour Decimal'] >= 8
+    source['Jumlah Masuk On Time'] = df['Is Check In On Time'] & df['Check In'].notna() & (df['Check In'] != '')
+    check_in = df['Check In Minutes'].astype('Float64').to_numpy(dtype=float, na_value=np.nan)
+    source['Check In'] = np.where(
+        (df['Is Present'] & ~df['Is Dayoff']).to_numpy() & (check_in != 0), check_in, np.nan
+    )
+    grouped = source.groupby(CUBE_KEYS, observed=True)
+    cube = grouped[list(CUBE_MEASURES)].sum()
+    # Join Date per karyawan (NaT jika export tidak memuatnya) untuk hari kerja prorata
+    join_dates = df['Join Date'] if 'Join Date' in df.columns else pd.Series(pd.NaT, index=df.index)
+    cube['Join Date'] = join_dates.groupby([df[key] for key in CUBE_KEYS], observed=True).min()
+    for column, func in CUBE_CHECK_IN_STATS.items():
+        cube[column] = grouped['Check In'].agg(func)
+    return cube.reset_index()[CUBE_KEYS + list(CUBE_MEASURES) + ['Join Date'] + list(CUBE_CHECK_IN_STATS)]
+
+
+def patch_employee_cube(cube, df, employee_ids, excluded=None):
+    """Cube setelah ingest inkremental: baris karyawan employee_ids dibangun ulang dari df, baris lain dipakai ulang.
+
+    Hasil sama dengan build_employee_cube(df, excluded) (urutan & kategori), biaya sebanding jumlah karyawan yang berubah.
+    """
+    changed = df['Employee ID'].isin(employee_ids).to_numpy()
+    fresh = build_employee_cube(df[changed], excluded[changed] if excluded is not None else None)
+    kept = cube[~cube['Employee ID'].isin(employee_ids).to_numpy()]
+    patched = pd.concat(union_categories([kept, fresh]), ignore_index=True)
+    # Kategori kunci mengikuti frame bulan (seperti groupby penuh), lalu urut seperti hasil groupby
+    for key in CUBE_KEYS:
+        if isinstance(df[key].dtype, pd.CategoricalDtype):
+            patched[key] = patched[key].cat.set_categories(df[key].cat.categories)
+    return patched.sort_values(CUBE_KEYS, kind='stable').reset_index(drop=True)
+
+
+def with_work_days(cube, period_start, period_end):
+    """Cube + kolom 'Work Days': hari kerja tiap karyawan dalam periode, sejak Join Date jika masuk di tengah periode."""
+    cube = cube.copy()
+    cube['Work Days'] = employee_work_days(cube['Join Date'], period_start, period_end)
+    return cube
+
+
+def _total_work_days(cube, by=None):
+    """Jumlah 'Work Days' per karyawan unik (karyawan dengan >1 baris cube dihitung sekali)."""
+    keys = (by or []) + ['Employee ID']
+    unique = cube.drop_duplicates(keys)
+    if not by:
+        return int(unique['Work Days'].sum())
+    return unique.groupby(by, observed=True)['Work Days'].sum()
+
+
+def slice_cube(cube, branch, org):
+    """Bagian cube untuk filter branch/org ('All' = semua organization di branch)."""
+    mask = cube['Branch'] == branch
+    if org != 'All':
+        mask &= cube['Organization'] == org
+    return cube[mask.to_numpy()]
+
+
+def rollup(cube, by=None):
+    """Roll-up cube ke level by (list kolom; None = satu baris total). 'Total Karyawan' = jumlah Employee ID unik."""
+    measures = list(CUBE_MEASURES)
+    if not by:
+        totals = cube[measures].sum()
+        totals['Total Karyawan'] = cube['Employee ID'].nunique()
+        return totals.to_frame().T
+    grouped = cube.groupby(by, observed=True)
+    result = grouped[measures].sum()
+    result['Total Karyawan'] = grouped['Employee ID'].nunique()
+    return result.reset_index()
+
+
+def employee_stats_from_cube(cube, work_days_month):
+    """Sama dengan calculate_employee_stats, dibaca dari cube (sudah di-slice).
+
+    Jika cube memuat 'Work Days' (with_work_days), Work Days & Plan dihitung per karyawan (prorata Join Date).
+    """
+    employee_stats = cube[CUBE_KEYS + [
+        'Jumlah Hadir', 'Jumlah Absen', 'Jumlah Hari Libur', 'Jumlah Cuti',
+        'Jumlah Late In', 'Jumlah Early Out',
+        'Total Jam Kerja (Real)', 'Total Jam Late In', 'Total Jam Early Out',
+    ]].reset_index(drop=True)
+    employee_stats['Work Days Bulan Ini'] = cube['Work Days'].to_numpy() if 'Work Days' in cube.columns else work_days_month
+    employee_stats['Total Jam Kerja (Plan)'] = employee_stats['Work Days Bulan Ini'] * 8
+    return employee_stats
+
+
+def employee_profiles_from_cube(cube):
+    """Profil per karyawan (satu baris per baris cube, sudah di-slice): hitungan, rasio compliance dan jam masuk.
+
+    Persentase 8 jam & on time dibagi jumlah hari record (seperti halaman detail); Kehadiran (%) dibagi Work Days
+    jika cube memuat 'Work Days' (with_work_days). Bisa langsung diurutkan/diekspor untuk semua karyawan.
+    """
+    profiles = cube[CUBE_KEYS + [
+        'Hari Record', 'Hari Dengan Jam Kerja', 'Jumlah Hadir', 'Jumlah Absen', 'Jumlah Cuti', 'Jumlah Sakit',
+        'Hari Kerja >= 8 Jam', 'Jumlah Masuk On Time',
+    ] + list(CUBE_CHECK_IN_STATS)].reset_index(drop=True)
+    days = profiles['Hari Record'].where(profiles['Hari Record'] > 0)
+    profiles['Hari Kerja >= 8 Jam (%)'] = (profiles['Hari Kerja >= 8 Jam'] / days * 100).fillna(0).round(2)
+    profiles['Masuk On Time (%)'] = (profiles['Jumlah Masuk On Time'] / days * 100).fillna(0).round(2)
+    if 'Work Days' in cube.columns:
+        work_days = pd.Series(cube['Work Days'].to_numpy(), index=profiles.index)
+        profiles['Work Days'] = work_days
+        profiles['Kehadiran (%)'] = (profiles['Jumlah Hadir'] / work_days.where(work_days > 0) * 100).fillna(0).round(2)
+    return profiles
+
+
+def organization_stats_from_cube(cube, work_days_month):
+    """Sama dengan calculate_organization_stats, hasil roll-up cube per Organization."""
+    org = rollup(cube, ['Organization'])
+    org_stats = pd.DataFrame({
+        'Organization': org['Organization'],
+        'Total Karyawan': org['Total Karyawan'],
+        'Total Kehadiran': org['Jumlah Hadir'],
+        'Total Tidak Hadir': org['Jumlah Absen'],
+        'Total Cuti': org['Jumlah Cuti'],
+        'Total Late In': org['Jumlah Late In'],
+        'Total Early Out': org['Jumlah Early Out'],
+        'Total Jam Kerja (Real)': org['Total Jam Kerja (Real)'],
+    })
+
+    # Hitung metrik tambahan (Total Work Day = jumlah hari kerja prorata per karyawan jika cube memuat 'Work Days')
+    org_stats['Work Day'] = work_days_month
+    if 'Work Days' in cube.columns:
+        org_stats['Total Work Day'] = org_stats['Organization'].map(_total_work_days(cube, ['Organization'])).astype('int64')
+    else:
+        org_stats['Total Work Day'] = org_stats['Total Karyawan'] * org_stats['Work Day']
+    org_stats['Total Jam Kerja (Plan)'] = org_stats['Total Work Day'] * 8
+
+    # Hitung persentase
+    org_stats['Kehadiran (%)'] = (org_stats['Total Kehadiran'] / org_stats['Total Work Day'] * 100).round(2)
+    org_stats['Tidak Hadir (%)'] = (org_stats['Total Tidak Hadir'] / org_stats['Total Work Day'] * 100).round(2)
+    org_stats['Plan vs Actual (%)'] = (org_stats['Total Jam Kerja (Real)'] / org_stats['Total Jam Kerja (Plan)'] * 100).round(2)
+
+    return org_stats
+
+
+def summary_totals_from_cube(cube):
+    """Total untuk Ringkasan Statistik (dict), roll-up penuh cube yang sudah di-slice."""
+    totals = rollup(cube).iloc[0]
+    return {
+        'total_employees': int(totals['Total Karyawan']),
+        'total_present': int(totals['Jumlah Hadir']),
+        'total_leave': int(totals['Jumlah Cuti']),
+        'total_dayoff': int(totals['Jumlah Hari Libur']),
+        'total_records': int(totals['Hari Record']),
+        'total_records_with_hours': int(totals['Hari Dengan Jam Kerja']),
+        # None = Total Karyawan × Work Day (tanpa prorata)
+        'total_work_day': _total_work_days(cube) if 'Work Days' in cube.columns else None,
+    }
@@ -0,0 +1,132 @@
+"""Kebijakan jadwal per shift/branch (config/schedule_policy.json): batas masuk/pulang per baris dari jadwal shift secara vektor"""
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from utils.time_parser import to_minutes, minutes_array
+
+
+SCHEDULE_POLICY_PATH = os.environ.get('ABSENCE_SCHEDULE_POLICY', os.path.join('config', 'schedule_policy.json'))
+
+DEFAULT_GRACE_MINUTES = 15
+DAY_MINUTES = 24 * 60
+
+_loaded = {}
+
+
+def schedule_policy(path=None):
+    """Isi config kebijakan jadwal (dibaca ulang otomatis jika file berubah). File tidak ada -> semua shift pakai kalender."""
+    path = path or SCHEDULE_POLICY_PATH
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+    except OSError:
+        mtime_ns = None
+    cached = _loaded.get(path)
+    if cached is None or cached[0] != mtime_ns:
+        if mtime_ns is None:
+            config, digest = {'calendar_shifts': None}, 'default'
+        else:
+            with open(path, 'rb') as f:
+                raw = f.read()
+            config, digest = json.loads(raw.decode('utf-8')), hashlib.sha1(raw).hexdigest()[:12]
+        cached = (mtime_ns, config, digest)
+        _loaded[path] = cached
+    return cached[1]
+
+
+def schedule_policy_version(path=None):
+    """Hash singkat isi config jadwal, untuk key cache hasil proses."""
+    path = path or SCHEDULE_POLICY_PATH
+    schedule_policy(path)
+    return _loaded[path][2]
+
+
+def _hhmm_or_nan(value):
+    if value is None:
+        return np.nan
+    if isinstance(value, str):
+        hours, minutes = value.strip().split(':')
+        return float(int(hours) * 60 + int(minutes))
+    return float(value)
+
+
+def _branch_table(branches, names, field, fallback):
+    """Array nilai per branch (urut names) + slot terakhir untuk branch yang tidak terdaftar (kode -1)."""
+    return np.array([float(branches[name].get(field, fallback)) for name in names] + [fallback], dtype=float)
+
+
+def resolve_schedule_policy(df, date_policy, policy=None):
+    """Batas masuk/pulang per baris dalam satu pass vektor.
+
+    - Shift di calendar_shifts (mis. Office) atau baris tanpa jadwal -> batas dari kalender (date_policy),
+      kecuali branch punya check_in_deadline/check_out_minimum sendiri untuk baris tanpa jadwal.
+    - Shift lain dengan Schedule In/Out -> batas masuk = jam masuk + grace branch, batas pulang = jam pulang.
+    Shift melewati tengah malam (jam pulang <= jam masuk) ditandai 'Is Overnight Shift'; batas tetap menit-dalam-hari.
+    """
+    policy = schedule_policy() if policy is None else policy
+    n = len(df)
+    schedule_in = minutes_array(to_minutes(df['Schedule In'])) if 'Schedule In' in df.columns else np.full(n, np.nan)
+    schedule_out = minutes_array(to_minutes(df['Schedule Out'])) if 'Schedule Out' in df.columns else np.full(n, np.nan)
+    # 00:00–00:00 = tidak ada jadwal (dayoff, Roster Leave, National Holiday)
+    has_schedule = ~np.isnan(schedule_in) & ~np.isnan(schedule_out) & ~((schedule_in == 0) & (schedule_out == 0))
+
+    calendar_shifts = policy.get('calendar_shifts')
+    if calendar_shifts is None:
+        calendar_shift = np.ones(n, dtype=bool)
+    else:
+        calendar_shift = df['Shift'].isin(calendar_shifts).to_numpy()
+    use_schedule = has_schedule & ~calendar_shift
+
+    # Join ke tabel branch lewat kode kategori (kode -1 = branch tidak terdaftar -> slot default terakhir)
+    branches = policy.get('branches', {})
+    names = list(branches)
+    codes = pd.Categorical(df['Branch'].astype(object), categories=names).codes
+    default_grace = float(policy.get('default', {}).get('grace_minutes', DEFAULT_GRACE_MINUTES))
+    grace = _branch_table(branches, names, 'grace_minutes', default_grace)[codes]
+    branch_deadline = np.array(
+        [_hhmm_or_nan(branches[name].get('check_in_deadline')) for name in names] + [np.nan]
+    )[codes]
+    branch_minimum = np.array(
+        [_hhmm_or_nan(branches[name].get('check_out_minimum')) for name in names] + [np.nan]
+    )[codes]
+
+    calendar_deadline = date_policy['Check In Deadline Minutes'].to_numpy(dtype=float)
+    calendar_minimum = date_policy['Check Out Minimum Minutes'].to_numpy(dtype=float)
+    branch_rule = ~has_schedule & ~calendar_shift
+    deadline = np.where(
+        use_schedule, schedule_in + grace,
+        np.where(branch_rule & ~np.isnan(branch_deadline), branch_deadline, calendar_deadline),
+    )
+    minimum = np.where(
+        use_schedule, schedule_out,
+        np.where(branch_rule & ~np.isnan(branch_minimum), branch_minimum, calendar_minimum),
+    )
+    return pd.DataFrame({
+        'Schedule In Minutes': pd.array(np.where(has_schedule, schedule_in, np.nan), dtype='Float64').astype('Int16'),
+        'Check In Deadline Minutes': deadline.astype(np.int16),
+        'Check Out Minimum Minutes': minimum.astype(np.int16),
+        'Is Overnight Shift': use_schedule & (schedule_out <= schedule_in),
+    }, index=df.index)
+
+
+def shift_relative_minutes(check_in, check_out, schedule_in, minimum, overnight):
+    """Menit Check In/Out & batas pulang relatif ke tanggal mulai shift (array float, NaN = kosong / tidak dinilai).
+
+    Shift malam (18:00–06:00): Check Out sebelum jam masuk dianggap hari berikutnya (+1440), Check In lebih dari
+    12 jam sebelum jam masuk juga (mis. 00:30 = terlambat, bukan datang awal), batas pulang +1440.
+    Pasangan jam yang bertentangan dengan jadwal (shift malam dengan jam 06:00–18:00, shift pagi dengan jam 18:00–06:00,
+    atau Check In > 12 jam setelah jam masuk) berarti label shift di export tidak sesuai: baris tersebut tidak dinilai
+    terhadap jadwal (NaN) sehingga tidak ditandai terlambat/pulang awal.
+    """
+    both = ~np.isnan(check_in) & ~np.isnan(check_out)
+    mismatch = ~np.isnan(schedule_in) & both & np.where(overnight, check_out >= check_in, check_out < check_in)
+    check_in_rel = np.where(overnight & (check_in < schedule_in - DAY_MINUTES / 2), check_in + DAY_MINUTES, check_in)
+    mismatch |= check_in_rel - schedule_in > DAY_MINUTES / 2
+    check_out_rel = np.where(overnight & (check_out < schedule_in), check_out + DAY_MINUTES, check_out)
+    minimum_rel = np.where(overnight, minimum + DAY_MINUTES, minimum)
+    check_in_rel = np.where(mismatch, np.nan, check_in_rel)
+    check_out_rel = np.where(mismatch, np.nan, check_out_rel)
+    return check_in_rel, check_out_rel, minimum_rel, mismatch
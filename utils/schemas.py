@@ -0,0 +1,157 @@
+"""Registry skema export Talenta dan reader CSV bertipe"""
+import csv
+import datetime
+from itertools import islice
+
+import pandas as pd
+
+
+# Kolom yang dipakai pipeline & UI (nama kanonik) beserta dtype saat dibaca.
+# Kolom lain di export (Overtime Break Before, Lock Status, dst.) tidak pernah dimuat.
+# Employee ID dibaca sebagai string karena export 2026 berisi baris 'TOTAL FOR EMPLOYEE : ...'.
+# String memakai dtype str (kosong = NaN), bukan 'string' nullable, agar perbandingan seperti == 'H' tetap bool biasa.
+_COMMON_DTYPES = {
+    'Employee ID': str,
+    'Full Name': str,
+    'Branch': 'category',
+    'Organization': 'category',
+    'Job Position': 'category',
+    'Date': str,
+    'Shift': 'category',
+    'Attendance Code': str,
+    'Time Off Code': str,
+    'Check In': str,
+    'Check Out': str,
+    'Join Date': str,
+    'Schedule In': 'category',
+    'Schedule Out': 'category',
+}
+
+# Varian export. 'signature' = kolom header (mentah) yang harus ada untuk mengenali varian.
+# 'columns' = nama header mentah -> nama kanonik.
+TALENTA_SCHEMAS = {
+    # Export 2025 (juga dipakai 2026/maret.csv): header bertanda '*', tanggal ISO, file ber-BOM,
+    # tanpa Late In / Early Out / Real Working Hour (dihitung dari Check In/Out). Ada Join Date (ISO).
+    'talenta_2025': {
+        'signature': ['Employee ID*', 'Date*', 'Schedule In', 'Schedule Out'],
+        'date_formats': ['%Y-%m-%d'],
+        'columns': {
+            'Employee ID*': 'Employee ID',
+            'Full Name': 'Full Name',
+            'Branch': 'Branch',
+            'Organization': 'Organization',
+            'Job Position': 'Job Position',
+            'Date*': 'Date',
+            'Shift': 'Shift',
+            'Attendance Code': 'Attendance Code',
+            'Time Off Code': 'Time Off Code',
+            'Check In': 'Check In',
+            'Check Out': 'Check Out',
+            'Join Date': 'Join Date',
+            'Schedule In': 'Schedule In',
+            'Schedule Out': 'Schedule Out',
+        },
+    },
+    # Export 2026 (january.csv, february.csv): ada Late In, Early Out, Actual/Real Working Hour dan
+    # Overtime Duration. Tanggal M/D/YYYY (january.csv) atau ISO + BOM (february.csv)
+    'talenta_2026': {
+        'signature': ['Employee ID', 'Date', 'Schedule Check In', 'Real Working Hour'],
+        'date_formats': ['%m/%d/%Y', '%Y-%m-%d'],
+        'columns': {
+            'Employee ID': 'Employee ID',
+            'Full Name': 'Full Name',
+            'Branch': 'Branch',
+            'Organization': 'Organization',
+            'Job Position': 'Job Position',
+            'Date': 'Date',
+            'Shift': 'Shift',
+            'Attendance Code': 'Attendance Code',
+            'Time Off Code': 'Time Off Code',
+            'Check In': 'Check In',
+            'Check Out': 'Check Out',
+            'Schedule Check In': 'Schedule In',
+            'Schedule Check Out': 'Schedule Out',
+            'Late In': 'Late In',
+            'Early Out': 'Early Out',
+            'Actual Working Hour': 'Actual Working Hour',
+            'Real Working Hour': 'Real Working Hour',
+        },
+    },
+}
+
+
+def read_header(filename):
+    """Daftar nama kolom mentah dari baris pertama CSV (BOM dibuang)."""
+    with open(filename, 'r', encoding='utf-8-sig', newline='') as f:
+        first_line = f.readline()
+    return [c.strip() for c in next(csv.reader([first_line]))]
+
+
+def detect_schema(header):
+    """Nama varian export dari daftar kolom header. ValueError jika tidak dikenali."""
+    header_set = set(header)
+    for name, schema in TALENTA_SCHEMAS.items():
+        if all(col in header_set for col in schema['signature']):
+            return name
+    raise ValueError(
+        "Format export Talenta tidak dikenali. Kolom header: " + ', '.join(header[:8]) + ('...' if len(header) > 8 else '')
+    )
+
+
+def sniff_date_format(filename, date_column, formats, sample_rows=50):
+    """Format tanggal (dari daftar kandidat) yang cocok dengan beberapa baris pertama. Default kandidat pertama."""
+    with open(filename, 'r', encoding='utf-8-sig', newline='') as f:
+        for row in islice(csv.DictReader(f), sample_rows):
+            value = (row.get(date_column) or '').strip()
+            if not value:
+                continue
+            for fmt in formats:
+                try:
+                    datetime.datetime.strptime(value, fmt)
+                    return fmt
+                except ValueError:
+                    continue
+    return formats[0]
+
+
+def _read_options(filename):
+    """(nama varian, kwargs read_csv, map kolom mentah -> kanonik, format tanggal) untuk file export."""
+    schema_name = detect_schema(read_header(filename))
+    schema = TALENTA_SCHEMAS[schema_name]
+    columns = schema['columns']
+    dtypes = {raw: _COMMON_DTYPES.get(canonical, str) for raw, canonical in columns.items()}
+    raw_date_column = next(raw for raw, canonical in columns.items() if canonical == 'Date')
+    date_format = sniff_date_format(filename, raw_date_column, schema['date_formats'])
+    options = {'encoding': 'utf-8-sig', 'usecols': list(columns), 'dtype': dtypes}
+    return schema_name, options, columns, date_format
+
+
+def _canonical(df, columns, date_format):
+    df = df.rename(columns=columns)[list(columns.values())]
+    df['Date'] = pd.to_datetime(df['Date'], format=date_format, errors='coerce')
+    return df
+
+
+def read_talenta_csv(filename):
+    """Baca CSV Talenta dengan usecols/dtype eksplisit sesuai varian; kolom diganti ke nama kanonik dan Date sudah datetime.
+
+    Mengembalikan (df, nama_varian).
+    """
+    schema_name, options, columns, date_format = _read_options(filename)
+    return _canonical(pd.read_csv(filename, **options), columns, date_format), schema_name
+
+
+def iter_talenta_csv(filename, chunk_rows):
+    """Sama dengan read_talenta_csv, tetapi per potongan maks. chunk_rows baris (generator (df, nama_varian)).
+
+    Varian & format tanggal dideteksi sekali dari header/baris awal; dtype sama untuk semua potongan.
+    """
+    schema_name, options, columns, date_format = _read_options(filename)
+    with pd.read_csv(filename, chunksize=chunk_rows, **options) as reader:
+        for chunk in reader:
+            yield _canonical(chunk, columns, date_format), schema_name
+
+
+def has_column(schema_name, canonical):
+    """True jika varian export memuat kolom kanonik tersebut."""
+    return canonical in TALENTA_SCHEMAS[schema_name]['columns'].values()
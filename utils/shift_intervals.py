@@ -0,0 +1,61 @@
+"""Durasi kerja lintas tengah malam (menit integer, vektor) dan pairing Check Out shift malam dengan baris hari berikutnya"""
+import numpy as np
+import pandas as pd
+
+from utils.schedule_policy import DAY_MINUTES
+from utils.time_parser import minutes_array
+
+
+# Jendela default pairing: Check In hari berikutnya maks. sekian menit setelah jam pulang jadwal
+DEFAULT_PAIR_WINDOW_MINUTES = 240
+
+# Durasi lintas tengah malam terpanjang yang masih masuk akal; lebih dari ini (mis. 18:14 -> 18:04) = urutan jam
+# tidak valid, dihitung 0 seperti sebelumnya
+MAX_SHIFT_MINUTES = 20 * 60
+
+
+def worked_minutes(check_in, check_out):
+    """Durasi per baris dari menit Check In/Out (Series Int32 hasil to_minutes) -> menit Int32, <NA> jika salah satu kosong.
+
+    Check Out lebih awal dari Check In dianggap hari berikutnya (+1440): 18:00 -> 06:00 = 720 menit, bukan 0
+    (maks. MAX_SHIFT_MINUTES).
+    """
+    check_in = pd.Series(check_in, copy=False)
+    ci = minutes_array(check_in)
+    co = minutes_array(check_out)
+    minutes = np.where(co < ci, co + DAY_MINUTES, co) - ci
+    minutes = np.where(minutes > MAX_SHIFT_MINUTES, 0.0, minutes)
+    return pd.Series(minutes, index=check_in.index).astype('Int32')
+
+
+def pair_next_day_check_out(employee_ids, dates, check_in, check_out, overnight, schedule_out,
+                            window=DEFAULT_PAIR_WINDOW_MINUTES):
+    """Durasi (menit, array float; NaN = tidak dipasangkan) untuk shift malam tanpa Check Out. check_in/check_out = menit.
+
+    Baris diurutkan per (Employee ID, Date) lalu digeser satu posisi dalam grup karyawan. Baris shift malam yang punya
+    Check In tanpa Check Out dipasangkan dengan baris hari berikutnya jika baris itu hanya berisi satu jam pagi
+    (Check In tanpa Check Out, sebelum jam pulang jadwal + window): jam tersebut adalah Check Out shift malam.
+    """
+    ids = np.asarray(employee_ids)
+    days = pd.to_datetime(pd.Series(dates, copy=False)).to_numpy(dtype='datetime64[D]')
+    ci = minutes_array(check_in)
+    co = minutes_array(check_out)
+    order = np.lexsort((days, ids))
+
+    s_ids, s_days, s_ci, s_co = ids[order], days[order], ci[order], co[order]
+    s_overnight = np.asarray(overnight, dtype=bool)[order]
+    s_end = np.asarray(schedule_out, dtype=float)[order]
+
+    # Geser -1 dalam urutan (employee, date): nilai baris berikutnya, valid hanya jika karyawan sama & tanggal +1
+    next_ci = np.append(s_ci[1:], np.nan)
+    next_co = np.append(s_co[1:], np.nan)
+    same_employee = np.append(s_ids[1:] == s_ids[:-1], False)
+    next_day = np.append(s_days[1:] - s_days[:-1] == np.timedelta64(1, 'D'), False)
+
+    candidate = s_overnight & ~np.isnan(s_ci) & np.isnan(s_co)
+    morning_punch = ~np.isnan(next_ci) & np.isnan(next_co) & (next_ci <= s_end + window)
+    paired = candidate & same_employee & next_day & morning_punch
+
+    result = np.full(len(order), np.nan)
+    result[order] = np.where(paired, next_ci + DAY_MINUTES - s_ci, np.nan)
+    return result
@@ -0,0 +1,75 @@
+"""Single-flight: panggilan bersamaan untuk key yang sama menunggu satu komputasi yang sedang berjalan, bukan menghitung ulang"""
+import threading
+
+
+# Semua koordinator per nama, untuk flight_stats()
+_registry = {}
+
+
+class _Call:
+    """Satu komputasi yang sedang berjalan; hasil/error dibagikan ke semua penunggu."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Koordinator per key: pemanggil pertama (leader) menjalankan fungsi, pemanggil lain dengan key sama menunggu hasilnya.
+
+    Key dilepas begitu komputasi selesai (ini bukan cache): panggilan berikutnya menjalankan fungsi lagi, jadi pasang
+    di depan fungsi yang hasilnya sudah di-cache di lapisan lain. Hasil yang sama dibagikan ke semua penunggu: read-only.
+    Tidak re-entrant untuk key yang sama di thread yang sama.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.calls = 0
+        self.executions = 0
+        self.coalesced = 0
+        _registry[name] = self
+
+    def do(self, key, fn, *args, **kwargs):
+        """fn(*args, **kwargs), atau hasil komputasi key yang sama yang sedang berjalan di thread lain."""
+        with self._lock:
+            self.calls += 1
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.executions += 1
+            else:
+                self.coalesced += 1
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        try:
+            call.result = fn(*args, **kwargs)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def stats(self):
+        """Counter: calls (semua panggilan), executions (fungsi benar-benar dijalankan), coalesced (ikut menunggu), in_flight."""
+        with self._lock:
+            return {
+                'calls': self.calls,
+                'executions': self.executions,
+                'coalesced': self.coalesced,
+                'in_flight': len(self._calls),
+            }
+
+
+def flight_stats():
+    """Counter semua koordinator: nama -> stats()."""
+    return {name: flight.stats() for name, flight in list(_registry.items())}
@@ -0,0 +1,91 @@
+"""Pemantau file sumber bulan (stat-polling): versi data yang berubah dibuang dari cache lalu dibangun ulang di background"""
+import logging
+import os
+import threading
+
+from utils.data_loader import catalog_months, data_version, refresh_month_catalog, forget_month_data
+from utils.analysis_context import forget_month_aggregates
+
+
+# Interval polling (detik); 0 = watcher tidak jalan (versi tetap dicek setiap load_data, hanya tanpa rebuild background)
+WATCH_INTERVAL_SECONDS = float(os.environ.get('ABSENCE_WATCH_INTERVAL', '5'))
+
+logger = logging.getLogger(__name__)
+
+
+def invalidate_month(month, version):
+    """Buang semua cache turunan bulan untuk versi data lama: frame, FilterIndex, cube dan konteks analisis."""
+    forget_month_data(month, version)
+    forget_month_aggregates(month, version)
+
+
+class SourceWatcher:
+    """Thread daemon yang setiap interval men-scan katalog dan membandingkan data_version tiap bulan.
+
+    Versi data = ukuran + mtime file + versi pipeline & config, jadi file yang diganti, bulan baru, maupun config
+    kebijakan yang diedit semuanya terdeteksi. Perubahan baru diproses setelah versinya sama di dua polling berturut-turut
+    (file yang masih disalin tidak memicu rebuild berkali-kali). on_change(month) dipanggil untuk bulan baru/berubah
+    setelah snapshot awal.
+    """
+
+    def __init__(self, on_change=None, interval=WATCH_INTERVAL_SECONDS):
+        self.on_change = on_change
+        self.interval = interval
+        # bulan -> versi yang sudah diterapkan / versi terakhir terlihat yang belum stabil
+        self._versions = {}
+        self._pending = {}
+        self._stop = threading.Event()
+        self._thread = None
+        if interval > 0:
+            self._thread = threading.Thread(target=self._run, name='source-watcher', daemon=True)
+            self._thread.start()
+
+    def _current_versions(self):
+        refresh_month_catalog()
+        versions = {}
+        for month in catalog_months():
+            try:
+                versions[month] = data_version(month)
+            except OSError:
+                # File dihapus di antara scan dan stat: tunggu polling berikutnya
+                continue
+        return versions
+
+    def poll(self):
+        """Satu putaran polling. Mengembalikan bulan yang baru/berubah (sudah stabil) pada putaran ini."""
+        current = self._current_versions()
+        # Polling pertama = snapshot awal: langsung diterima tanpa invalidasi/on_change (prewarm awal diurus start_prewarm)
+        first = not self._versions
+        changed = []
+        for month, version in current.items():
+            applied = self._versions.get(month)
+            if applied == version:
+                self._pending.pop(month, None)
+                continue
+            if not first and self._pending.get(month) != version:
+                self._pending[month] = version
+                continue
+            self._pending.pop(month, None)
+            if applied is not None:
+                invalidate_month(month, applied)
+            self._versions[month] = version
+            changed.append(month)
+        for month in [month for month in self._versions if month not in current]:
+            # Bulan hilang dari katalog (file dihapus/dipindah)
+            invalidate_month(month, self._versions.pop(month))
+            self._pending.pop(month, None)
+        if self.on_change is not None and not first:
+            for month in changed:
+                self.on_change(month)
+        return changed
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.poll()
+            except Exception:
+                logger.exception("Polling file sumber gagal")
+            self._stop.wait(self.interval)
+
+    def stop(self):
+        self._stop.set()
@@ -0,0 +1,59 @@
+"""Parser waktu/durasi vektor (H:MM, HH:MM, HH:MM:SS) untuk kolom jam Talenta"""
+import numpy as np
+import pandas as pd
+
+
+# Jam bisa lebih dari 2 digit untuk durasi (mis. '257:23:00' di baris total); detik diabaikan (dibulatkan ke bawah)
+_HHMM_PATTERN = r'^(\d{1,5}):(\d{2})(?::\d{2})?$'
+
+
+def to_minutes(values, zero_as_missing=False):
+    """Series string waktu/durasi -> menit (Int32 nullable).
+
+    Kosong, NaN atau format tidak valid -> <NA>. Jika zero_as_missing=True, '00:00' juga dianggap <NA>
+    (dipakai untuk jam Check In, di mana 00:00 berarti tidak ada data).
+    """
+    s = pd.Series(values, copy=False)
+    # Nilai jam sangat berulang (maks. ~1.500 string unik per bulan): parse hanya nilai unik, lalu sebar via kode
+    codes, uniques = pd.factorize(s)
+    parts = pd.Series(uniques, dtype='string').str.strip().str.extract(_HHMM_PATTERN)
+    hours = pd.to_numeric(parts[0], errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+    minutes = pd.to_numeric(parts[1], errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+    # Slot terakhir = NaN untuk kode -1 (nilai kosong)
+    lookup = np.append(hours * 60 + minutes, np.nan)
+    if zero_as_missing:
+        lookup[lookup == 0] = np.nan
+    total = lookup[np.where(codes < 0, len(lookup) - 1, codes)]
+    return pd.Series(total, index=s.index, name=s.name).astype('Int32')
+
+
+def minutes_to_hours(minutes):
+    """Menit (boleh <NA>) -> jam desimal float; <NA> dihitung 0."""
+    return pd.Series(minutes, copy=False).astype('Float64').fillna(0).astype(float) / 60.0
+
+
+def is_nonzero(minutes):
+    """Flag bool: True jika durasi ada dan > 0 (<NA> -> False)."""
+    return pd.Series(minutes, copy=False).fillna(0).astype('int64') > 0
+
+
+def minutes_to_hhmm(minutes):
+    """Menit (boleh <NA>) -> string 'HH:MM'; <NA> -> '00:00'."""
+    m = pd.Series(minutes, copy=False).fillna(0).round().astype('int64')
+    return (
+        (m // 60).astype(str).str.zfill(2) + ':' + (m % 60).astype(str).str.zfill(2)
+    )
+
+
+def parse_duration_columns(df, columns):
+    """Parse beberapa kolom durasi sekaligus -> dict {kolom: (menit, flag > 0)}."""
+    result = {}
+    for col in columns:
+        minutes = to_minutes(df[col])
+        result[col] = (minutes, is_nonzero(minutes))
+    return result
+
+
+def minutes_array(minutes):
+    """Menit Int32 nullable -> ndarray float64 dengan NaN untuk nilai kosong (untuk operasi NumPy bermask)."""
+    return pd.Series(minutes, copy=False).astype('Float64').to_numpy(dtype=float, na_value=np.nan)